@@ -5,3 +5,5 @@ from .cache import *
 from .clients import *
 from .compatibility import *
 from .manager import *
+from .ratelimit import *
+from .scheduler import *
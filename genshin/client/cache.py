@@ -3,19 +3,51 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import collections
+import contextlib
+import contextvars
 import dataclasses
+import datetime
 import enum
-import json
+import functools
+import heapq
+import itertools
+import logging
+import re
 import sys
 import time
 import typing
+import zlib
+
+from genshin import constants, types
+from genshin.utility import codec as codec_utility
+from genshin.utility import uid as uid_utility
 
 if typing.TYPE_CHECKING:
     import aioredis
     import aiosqlite
 
 
-__all__ = ["BaseCache", "Cache", "RedisCache", "SQLiteCache", "StaticCache"]
+__all__ = [
+    "BaseCache",
+    "Cache",
+    "CachePolicy",
+    "CacheStatistics",
+    "CacheStats",
+    "GameReset",
+    "RedisCache",
+    "SQLiteCache",
+    "SizedCache",
+    "StaticCache",
+    "TTLPolicy",
+    "TieredCache",
+    "get_cache_policy",
+    "get_cached_error",
+    "use_cache_policy",
+]
+
+_LOGGER = logging.getLogger(__name__)
 
 MINUTE = 60
 HOUR = MINUTE * 60
@@ -40,29 +72,482 @@ def _separate(values: typing.Iterable[typing.Any], sep: str = ":") -> str:
     return sep.join(parts)
 
 
-@dataclasses.dataclass(eq=False)
+@dataclasses.dataclass(frozen=True, eq=False)
 class CacheKey:
+    """Immutable key of a cached item.
+
+    The string form and hash are computed once on creation, subclasses must be frozen dataclasses too, ideally `with_slots`.
+    """
+
+    __slots__ = ("_hash", "_str")
+
+    if typing.TYPE_CHECKING:
+        _str: str = dataclasses.field(init=False, repr=False)
+        _hash: int = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        string = self._to_str()
+        object.__setattr__(self, "_str", string)
+        object.__setattr__(self, "_hash", hash(string))
+
+    def _to_str(self) -> str:
+        """Build the string form of the key."""
+        return _separate([getattr(self, field.name) for field in dataclasses.fields(self)])
+
     def __str__(self) -> str:
-        values = [getattr(self, field.name) for field in dataclasses.fields(self)]
-        return _separate(values)
+        return self._str
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, o: object) -> bool:
-        return isinstance(o, CacheKey) and str(self) == str(o)
+        return self is o or (isinstance(o, CacheKey) and self._hash == o._hash and self._str == o._str)
 
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        return type(self), tuple(getattr(self, field.name) for field in dataclasses.fields(self))
 
-def cache_key(key: str, **kwargs: typing.Any) -> CacheKey:
+    @property
+    def family(self) -> str:
+        """Family of the key used to group statistics."""
+        return str(getattr(self, "key", type(self).__name__))
+
+
+CacheKeyT = typing.TypeVar("CacheKeyT", bound=CacheKey)
+
+
+def with_slots(cls: type[CacheKeyT]) -> type[CacheKeyT]:
+    """Recreate a frozen dataclass key with slots for its fields.
+
+    This is `dataclass(slots=True)` which needs python 3.10.
+    The class is recreated so its methods cannot use `super()` without arguments.
+    """
+    names = tuple(cls.__dict__.get("__annotations__", {}))
+    namespace = {name: value for name, value in cls.__dict__.items() if name not in (*names, "__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return typing.cast("type[CacheKeyT]", type(cls.__name__, cls.__bases__, namespace))
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_key_class(key: str, fields: tuple[str, ...]) -> typing.Callable[..., CacheKey]:
+    """Create a cache key class for a key schema once."""
     name = key.capitalize() + "CacheKey"
-    fields = ["key"] + list(kwargs.keys())
-    cls = dataclasses.make_dataclass(name, fields, bases=(CacheKey,), eq=False)
-    return typing.cast("CacheKey", cls(key, **kwargs))
+    cls = type(name, (CacheKey,), {"__annotations__": dict.fromkeys(("key", *fields), "typing.Any")})
+    return with_slots(dataclasses.dataclass(frozen=True, eq=False)(cls))
+
+
+def cache_key(key: str, **kwargs: typing.Any) -> CacheKey:
+    """Create a cache key from a name and keyword fields, keys with the same fields share a class."""
+    cls = _cache_key_class(key, tuple(kwargs.keys()))
+    return cls(key, **kwargs)
+
+
+def key_family(key: typing.Any) -> str:
+    """Get the family of a cache key or of its string form."""
+    if isinstance(key, CacheKey):
+        return key.family
+
+    parts = str(key).split(":", 3)
+    if parts[0] == "chronicle" and len(parts) > 2:
+        return "chronicle:" + parts[2]
+
+    return parts[0]
+
+
+def _check_filters(prefix: typing.Optional[str], tags: list[str]) -> list[str]:
+    """Make sure invalidation has at least one filter."""
+    if prefix is None and not tags:
+        raise TypeError("At least one filter must be given to invalidate objects.")
+
+    return tags
+
+
+def key_tags(key: typing.Any) -> list[str]:
+    """Get the tags of a cache key by which it can be invalidated."""
+    family = key_family(key)
+    tags = ["family:" + family]
+    if ":" in family:
+        tags.append("family:" + family.split(":", 1)[0])
+
+    for field in ("uid", "hoyolab_id", "game"):
+        value = getattr(key, field, None)
+        if value is not None:
+            tags.append(f"{field}:{_separate([value])}")
+
+    return tags
+
+
+def invalidation_tags(
+    *,
+    uid: typing.Optional[int] = None,
+    hoyolab_id: typing.Optional[int] = None,
+    game: typing.Optional[types.Game] = None,
+    family: typing.Optional[str] = None,
+) -> list[str]:
+    """Get the tags a cache key must have to be invalidated."""
+    tags: list[str] = []
+    if family is not None:
+        tags.append("family:" + family)
+
+    for field, value in (("uid", uid), ("hoyolab_id", hoyolab_id), ("game", game)):
+        if value is not None:
+            tags.append(f"{field}:{_separate([value])}")
+
+    return tags
+
+
+class CachePolicy(str, enum.Enum):
+    """How a request uses the cache."""
+
+    CACHE_FIRST = "cache-first"
+    """Return cached data if there is any, otherwise make a request and cache its response."""
+
+    NETWORK_ONLY = "network-only"
+    """Always make a request and cache its response."""
+
+    CACHE_ONLY = "cache-only"
+    """Never make a request, raise `CacheMiss` if nothing is cached."""
+
+    STALE_IF_ERROR = "stale-if-error"
+    """Like cache-first but return stale data if the request fails."""
+
+
+_cache_policy: contextvars.ContextVar[typing.Optional[CachePolicy]] = contextvars.ContextVar(
+    "genshin_cache_policy", default=None
+)
+
+
+def get_cache_policy() -> typing.Optional[CachePolicy]:
+    """Get the cache policy set with `use_cache_policy` in the current context."""
+    return _cache_policy.get()
+
+
+@contextlib.contextmanager
+def use_cache_policy(policy: typing.Union[CachePolicy, str]) -> typing.Iterator[None]:
+    """Use a cache policy for all requests made in a block, including ones of concurrent tasks it starts."""
+    token = _cache_policy.set(CachePolicy(policy))
+    try:
+        yield
+    finally:
+        _cache_policy.reset(token)
+
+
+CACHED_ERROR_KEY: typing.Final[str] = "$error"
+
+
+def get_cached_error(value: typing.Any) -> typing.Optional[typing.Mapping[str, typing.Any]]:
+    """Get the response of an error saved by a cache."""
+    if isinstance(value, dict) and CACHED_ERROR_KEY in value:
+        return typing.cast("typing.Mapping[str, typing.Any]", value[CACHED_ERROR_KEY])
+
+    return None
+
+
+VALIDATORS_KEY: typing.Final[str] = "$validators"
+VALIDATED_DATA_KEY: typing.Final[str] = "$data"
+
+
+def with_validators(value: typing.Any, validators: typing.Mapping[str, str]) -> typing.Any:
+    """Save the validators of a static file along with it, they expire together."""
+    if not validators:
+        return value
+
+    return {VALIDATED_DATA_KEY: value, VALIDATORS_KEY: dict(validators)}
+
+
+def split_validators(value: typing.Any) -> tuple[typing.Any, typing.Mapping[str, str]]:
+    """Get a static file and its validators saved by a cache."""
+    if isinstance(value, dict) and VALIDATORS_KEY in value:
+        return value[VALIDATED_DATA_KEY], typing.cast("typing.Mapping[str, str]", value[VALIDATORS_KEY])
+
+    return value, {}
+
+
+def load_response_body(
+    body: typing.Union[str, bytes], json_codec: typing.Optional[codec_utility.JSONCodec] = None
+) -> typing.Any:
+    """Load the data of a raw response body saved by a cache."""
+    data = (json_codec or codec_utility.get_default_json_codec()).loads(body)
+    if isinstance(data, dict) and "data" in data:
+        return data["data"]
+
+    return data
+
+
+def estimate_size(value: typing.Any) -> int:
+    """Estimate the memory size of a value in bytes."""
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+
+    if isinstance(value, typing.Mapping):
+        items = typing.cast("typing.Mapping[typing.Any, typing.Any]", value).items()
+        return size + sum(estimate_size(k) + estimate_size(v) for k, v in items)
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item) for item in value)  # pyright: ignore[reportUnknownVariableType]
+
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value))
+
+    return size
+
+
+@dataclasses.dataclass(frozen=True)
+class GameReset:
+    """Expiration at the next game reset on the server of an account.
+
+    Resets happen every day, week or month at `hour` in the timezone of the server.
+    Keys without a uid and game expire at the earliest reset of all servers.
+    """
+
+    period: typing.Literal["daily", "weekly", "monthly"] = "daily"
+    hour: int = 4
+    weekday: int = 0
+    day: int = 1
+    maximum: typing.Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.day <= 28:
+            raise ValueError("Monthly resets must happen on a day every month has, between 1 and 28.")
+
+    def next_reset(self, offset: int, now: typing.Optional[datetime.datetime] = None) -> datetime.datetime:
+        """Get the next reset on a server with a timezone offset."""
+        tz = datetime.timezone(datetime.timedelta(hours=offset))
+        now = (now or datetime.datetime.now(tz)).astimezone(tz)
+        reset = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+
+        if self.period == "daily":
+            if reset <= now:
+                reset += datetime.timedelta(days=1)
+        elif self.period == "weekly":
+            reset += datetime.timedelta(days=(self.weekday - now.weekday()) % 7)
+            if reset <= now:
+                reset += datetime.timedelta(weeks=1)
+        else:
+            reset = reset.replace(day=self.day)
+            if reset <= now:
+                year, month = divmod(reset.month, 12)
+                reset = reset.replace(year=reset.year + year, month=month + 1)
+
+        return reset
+
+    def get_ttl(self, key: typing.Any) -> float:
+        """Get the ttl of an item with a key."""
+        uid: typing.Optional[int] = getattr(key, "uid", None)
+        game: typing.Optional[types.Game] = getattr(key, "game", None)
+        offset = uid_utility.recognize_server_timezone(uid, game) if uid and game else None
+        offsets = [offset] if offset is not None else list(constants.SERVER_TIMEZONE_OFFSETS)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        ttl = min((self.next_reset(offset, now) - now).total_seconds() for offset in offsets)
+        if self.maximum is not None:
+            ttl = min(ttl, self.maximum)
+
+        return ttl
+
+    def capped(self, maximum: float) -> GameReset:
+        """Create a copy of the reset which never expires later than a maximum."""
+        return dataclasses.replace(self, maximum=min(maximum, self.maximum or maximum))
+
+
+class TTLPolicy:
+    """Time to live of cached items by the family of their keys.
+
+    Families are looked up exactly and then by the part before the first colon,
+    so `chronicle` applies to all battle chronicle endpoints without their own entry.
+    Items of families without an entry use the ttl of the cache.
+    Entries may be a `GameReset` to expire items at the next reset of their server.
+    """
+
+    ttls: dict[str, typing.Union[float, GameReset]]
+
+    def __init__(
+        self,
+        ttls: typing.Optional[typing.Mapping[str, typing.Union[float, GameReset]]] = None,
+        /,
+        **kwargs: typing.Union[float, GameReset],
+    ) -> None:
+        self.ttls = {**(ttls or {}), **kwargs}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.ttls!r})"
+
+    @classmethod
+    def recommended(cls) -> TTLPolicy:
+        """Create a policy fitting how often the data of common endpoints changes."""
+        return cls(
+            {
+                # real-time notes
+                "chronicle:dailyNote": MINUTE,
+                "chronicle:note": MINUTE,
+                # seasonal challenges, never served across a season change
+                "chronicle:spiralAbyss": GameReset("monthly", day=16, maximum=HOUR),
+                "chronicle:role_combat": GameReset("monthly", day=1, maximum=HOUR),
+                "chronicle:hard_challenge": HOUR,
+                "chronicle:challenge": HOUR,
+                "chronicle:challenge_story": HOUR,
+                "chronicle:challenge_boss": HOUR,
+                "chronicle:mem_detail": HOUR,
+                # event calendars
+                "chronicle:act_calendar": GameReset(maximum=DAY),
+                "chronicle:get_act_calender": GameReset(maximum=DAY),
+                "diary": 5 * MINUTE,
+                "records": 5 * MINUTE,
+                "lineup": DAY,
+                "banner": DAY,
+                "calculator": DAY,
+                "wiki": DAY,
+                "mi18n": WEEK,
+            }
+        )
+
+    def lookup(self, family: str) -> typing.Union[float, GameReset, None]:
+        """Get the ttl of a key family if the policy has one."""
+        ttl = self.ttls.get(family)
+        if ttl is None and ":" in family:
+            ttl = self.ttls.get(family.split(":", 1)[0])
+
+        return ttl
+
+    def get_ttl(self, key: typing.Any, default: float) -> float:
+        """Get the ttl of an item with a key."""
+        ttl = self.lookup(key_family(key))
+        if ttl is None:
+            return default
+        if isinstance(ttl, GameReset):
+            return ttl.get_ttl(key)
+
+        return ttl
+
+    def capped(self, maximum: float) -> TTLPolicy:
+        """Create a copy of the policy with no ttl longer than a maximum."""
+        return type(self)(
+            {
+                family: ttl.capped(maximum) if isinstance(ttl, GameReset) else min(ttl, maximum)
+                for family, ttl in self.ttls.items()
+            }
+        )
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Statistics of a cache or of a family of keys."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    bytes: int = 0
+    """Approximate size of all objects currently saved, only known to caches which remove items themselves."""
+    bytes_written: int = 0
+    """Approximate size of all objects ever saved."""
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of lookups which were hits, including stale hits."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / lookups if lookups else 0
+
+
+class CacheStatistics:
+    """Statistics of a cache broken down by key family.
+
+    Families are the `key` of `cache_key` or the endpoint of battle chronicle keys.
+    Expirations and evictions are only known to in-memory caches.
+    """
+
+    families: dict[str, CacheStats]
+
+    def __init__(self) -> None:
+        self.families = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.total}>"
+
+    @property
+    def total(self) -> CacheStats:
+        """Statistics of all families combined."""
+        total = CacheStats()
+        for stats in self.families.values():
+            for field in dataclasses.fields(CacheStats):
+                setattr(total, field.name, getattr(total, field.name) + getattr(stats, field.name))
+
+        return total
+
+    def for_key(self, key: typing.Any) -> CacheStats:
+        """Get the statistics of the family of a key."""
+        family = key_family(key)
+        if (stats := self.families.get(family)) is None:
+            stats = self.families[family] = CacheStats()
+
+        return stats
+
+    def record_lookup(self, key: typing.Any, value: typing.Any, *, stale: bool = False) -> None:
+        """Record the result of a lookup."""
+        stats = self.for_key(key)
+        if value is None:
+            stats.misses += 1
+        elif stale:
+            stats.stale_hits += 1
+        else:
+            stats.hits += 1
+
+    def record_set(self, key: typing.Any, size: int, *, replaced: typing.Optional[int] = None) -> None:
+        """Record a saved object and its size.
+
+        Caches which know the size of the object it replaced, 0 if there was none, also track the current size.
+        """
+        stats = self.for_key(key)
+        stats.sets += 1
+        stats.bytes_written += size
+        if replaced is not None:
+            stats.bytes += size - replaced
+
+    def record_removal(self, key: typing.Any, size: int) -> None:
+        """Record the size of a removed object."""
+        self.for_key(key).bytes -= size
+
+    def record_expiration(self, key: typing.Any) -> None:
+        """Record an expired object."""
+        self.for_key(key).expirations += 1
+
+    def record_eviction(self, key: typing.Any) -> None:
+        """Record an evicted object."""
+        self.for_key(key).evictions += 1
+
+    def clear(self) -> None:
+        """Reset all statistics."""
+        self.families.clear()
 
 
 class BaseCache(abc.ABC):
     """Base cache for the client."""
 
+    ttl_policy: typing.Optional[TTLPolicy] = None
+    """Time to live of items by the family of their keys, overriding the ttl of the cache."""
+    error_ttl: float = MINUTE
+    """Time to live of saved errors, errors are not saved if not positive."""
+
+    def get_ttl(self, key: typing.Any, default: float) -> float:
+        """Get the ttl of an item with a key according to the ttl policy."""
+        if self.ttl_policy is None:
+            return default
+
+        return self.ttl_policy.get_ttl(key, default)
+
+    @property
+    def stats(self) -> CacheStatistics:
+        """Statistics of the cache."""
+        # created lazily since subclasses are not required to call __init__
+        stats: typing.Optional[CacheStatistics] = getattr(self, "_stats", None)
+        if stats is None:
+            stats = self._stats = CacheStatistics()
+
+        return stats
+
     @abc.abstractmethod
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
@@ -79,56 +564,202 @@ class BaseCache(abc.ABC):
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
 
+    async def get_static_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get a static object with a key and whether it is stale.
+
+        Caches which keep expired static objects around may return them marked as stale.
+        """
+        return await self.get_static(key), False
+
+    async def get_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale.
+
+        Caches which keep expired objects around may return them marked as stale.
+        """
+        return await self.get(key), False
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> list[typing.Optional[typing.Any]]:
+        """Get several objects with their keys."""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save several objects with their keys."""
+        for key, value in items.items():
+            if static:
+                await self.set_static(key, value)
+            else:
+                await self.set(key, value)
+
+    async def set_response(
+        self, key: typing.Any, response: typing.Any, raw_body: typing.Optional[bytes], *, static: bool = False
+    ) -> None:
+        """Save a response with a key along with the raw body it was decoded from.
+
+        Caches which don't override this save the response like any other object.
+        """
+        if static:
+            await self.set_static(key, response)
+        else:
+            await self.set(key, response)
+
+    async def set_error(self, key: typing.Any, response: typing.Mapping[str, typing.Any]) -> None:
+        """Save the response of an error with a key, it is reraised when the key is requested.
+
+        Caches which don't override this save errors like any other object.
+        """
+        if self.error_ttl > 0:
+            await self.set(key, {CACHED_ERROR_KEY: dict(response)})
+
+    async def invalidate(
+        self,
+        *,
+        prefix: typing.Optional[str] = None,
+        uid: typing.Optional[int] = None,
+        hoyolab_id: typing.Optional[int] = None,
+        game: typing.Optional[types.Game] = None,
+        family: typing.Optional[str] = None,
+    ) -> int:
+        """Remove all objects whose keys match every given filter and return how many were removed.
+
+        Families also match their subfamilies, `chronicle` matches every battle chronicle endpoint.
+        Caches which don't override this keep all objects.
+        """
+        return 0
+
 
 class Cache(BaseCache):
-    """Standard implementation of the cache."""
+    """Standard implementation of the cache.
 
-    cache: dict[typing.Any, tuple[float, typing.Any]]
+    Items are evicted in least-recently-used order and expire lazily in amortized constant time.
+    Expired items are kept as stale for `stale_ttl` seconds.
+    """
+
+    # {key: (expiration, value, size)}
+    cache: collections.OrderedDict[typing.Any, tuple[float, typing.Any, int]]
     maxsize: int
     ttl: float
     static_ttl: float
+    stale_ttl: float
+
+    # min-heap of (expiration, tiebreaker, key), may contain outdated entries
+    _expirations: list[tuple[float, int, typing.Any]]
+    _counter: typing.Iterator[int]
 
-    def __init__(self, maxsize: int = 1024, *, ttl: float = HOUR, static_ttl: float = DAY) -> None:
-        self.cache = {}
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        *,
+        ttl: float = HOUR,
+        static_ttl: float = DAY,
+        stale_ttl: float = 0,
+        ttl_policy: typing.Optional[TTLPolicy] = None,
+    ) -> None:
+        self.cache = collections.OrderedDict()
         self.maxsize = maxsize
 
         self.ttl = ttl
         self.static_ttl = static_ttl
+        self.stale_ttl = stale_ttl
+        self.ttl_policy = ttl_policy
+
+        self._expirations = []
+        self._counter = itertools.count()
 
     def __len__(self) -> int:
         self._clear_cache()
         return len(self.cache)
 
     def _clear_cache(self) -> None:
-        """Clear timed-out items."""
+        """Clear timed-out and overflowing items."""
         # since this is always called from an async function we don't need locks
         now = time.time()
 
-        for key, value in self.cache.copy().items():
-            if value[0] < now:
-                del self.cache[key]
+        while self._expirations and self._expirations[0][0] < now:
+            expiration, _, key = heapq.heappop(self._expirations)
+            item = self.cache.get(key)
+            # the key might have been overwritten with a later expiration
+            if item is not None and item[0] == expiration:
+                self._remove(key)
+                self.stats.record_expiration(key)
+
+        self._evict()
+
+        # drop outdated heap entries once they outnumber the live ones
+        if len(self._expirations) > 2 * len(self.cache) + 64:
+            self._expirations = [
+                entry for entry in self._expirations if self.cache.get(entry[2], (None,))[0] == entry[0]
+            ]
+            heapq.heapify(self._expirations)
+
+    def _evict(self) -> None:
+        """Evict least recently used items until the cache fits."""
+        while len(self.cache) > self.maxsize:
+            key = next(iter(self.cache))
+            self._remove(key)
+            self.stats.record_eviction(key)
+
+    def _insert(self, key: typing.Any, item: tuple[float, typing.Any, int]) -> None:
+        """Insert an item as the most recently used one."""
+        old = self.cache.get(key)
+        self.cache[key] = item
+        self.cache.move_to_end(key)
+        self.stats.record_set(key, item[2], replaced=old[2] if old else 0)
+
+    def _remove(self, key: typing.Any) -> None:
+        """Remove an item."""
+        _, _, size = self.cache.pop(key)
+        self.stats.record_removal(key, size)
+
+    def _estimate_size(self, value: typing.Any, raw_body: typing.Optional[bytes] = None) -> int:
+        """Estimate the size of an object, only known for responses saved with their raw body."""
+        return len(raw_body) if raw_body is not None else 0
+
+    def _set(self, key: typing.Any, value: typing.Any, ttl: float, *, raw_body: typing.Optional[bytes] = None) -> None:
+        """Save an object with a key and a ttl."""
+        # stored expirations include the time the item is kept as stale
+        expiration = time.time() + ttl + self.stale_ttl
+        self._insert(key, (expiration, value, self._estimate_size(value, raw_body)))
+        heapq.heappush(self._expirations, (expiration, next(self._counter), key))
 
-        if len(self.cache) > self.maxsize:
-            overflow = len(self.cache) - self.maxsize
-            keys = list(self.cache.keys())[:overflow]
+        self._clear_cache()
 
-            for key in keys:
-                del self.cache[key]
+    def _get(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale."""
+        item = self.cache.get(key)
+        if item is None:
+            return None, False
+
+        now = time.time()
+        if item[0] < now:
+            self._remove(key)
+            self.stats.record_expiration(key)
+            return None, False
+
+        self.cache.move_to_end(key)
+        return item[1], item[0] - self.stale_ttl < now
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
-        self._clear_cache()
+        value, stale = self._get(key)
+        if stale:
+            value = None
 
-        if key not in self.cache:
-            return None
+        self.stats.record_lookup(key, value)
+        return value
 
-        return self.cache[key][1]
+    async def get_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale."""
+        value, stale = self._get(key)
+        self.stats.record_lookup(key, value, stale=stale)
+        return value, stale
+
+    async def get_static_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get a static object with a key and whether it is stale."""
+        return await self.get_entry(key)
 
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
-        self.cache[key] = (time.time() + self.ttl, value)
-
-        self._clear_cache()
+        self._set(key, value, self.get_ttl(key, self.ttl))
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
@@ -136,80 +767,593 @@ class Cache(BaseCache):
 
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        self.cache[key] = (time.time() + self.static_ttl, value)
+        self._set(key, value, self.get_ttl(key, self.static_ttl))
 
-        self._clear_cache()
+    async def set_response(
+        self, key: typing.Any, response: typing.Any, raw_body: typing.Optional[bytes], *, static: bool = False
+    ) -> None:
+        """Save a response with a key, the raw body is only used to know its size."""
+        self._set(key, response, self.get_ttl(key, self.static_ttl if static else self.ttl), raw_body=raw_body)
+
+    async def set_error(self, key: typing.Any, response: typing.Mapping[str, typing.Any]) -> None:
+        """Save the response of an error with a key for `error_ttl` seconds."""
+        if self.error_ttl > 0:
+            self._set(key, {CACHED_ERROR_KEY: dict(response)}, self.error_ttl)
+
+    async def invalidate(
+        self,
+        *,
+        prefix: typing.Optional[str] = None,
+        uid: typing.Optional[int] = None,
+        hoyolab_id: typing.Optional[int] = None,
+        game: typing.Optional[types.Game] = None,
+        family: typing.Optional[str] = None,
+    ) -> int:
+        """Remove all objects whose keys match every given filter and return how many were removed."""
+        tags = _check_filters(prefix, invalidation_tags(uid=uid, hoyolab_id=hoyolab_id, game=game, family=family))
+
+        keys = [
+            key
+            for key in self.cache
+            if (prefix is None or str(key).startswith(prefix)) and all(tag in key_tags(key) for tag in tags)
+        ]
+        for key in keys:
+            self._remove(key)
+
+        return len(keys)
+
+
+class SizedCache(Cache):
+    """Cache bounded by the estimated memory size of its items.
+
+    When full, the largest of the `eviction_window` least recently used items is evicted first.
+    Items larger than `maxbytes` are never saved.
+    """
+
+    maxbytes: int
+    eviction_window: int
+
+    _size: int
+
+    def __init__(
+        self,
+        maxbytes: int = 64 * 1024 * 1024,
+        *,
+        maxsize: int = sys.maxsize,
+        ttl: float = HOUR,
+        static_ttl: float = DAY,
+        stale_ttl: float = 0,
+        ttl_policy: typing.Optional[TTLPolicy] = None,
+        eviction_window: int = 8,
+    ) -> None:
+        super().__init__(maxsize, ttl=ttl, static_ttl=static_ttl, stale_ttl=stale_ttl, ttl_policy=ttl_policy)
+        self.maxbytes = maxbytes
+        self.eviction_window = eviction_window
+
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Estimated memory size of all items in bytes."""
+        return self._size
+
+    def _estimate_size(self, value: typing.Any, raw_body: typing.Optional[bytes] = None) -> int:
+        """Estimate the memory size of an object."""
+        return estimate_size(value)
+
+    def _evict(self) -> None:
+        """Evict large and least recently used items until the cache fits."""
+        super()._evict()
+
+        while self._size > self.maxbytes and self.cache:
+            candidates = itertools.islice(self.cache, self.eviction_window)
+            key = max(candidates, key=lambda key: self.cache[key][2])
+            self._remove(key)
+            self.stats.record_eviction(key)
+
+    def _insert(self, key: typing.Any, item: tuple[float, typing.Any, int]) -> None:
+        """Insert an item as the most recently used one, unless it could never fit."""
+        if item[2] > self.maxbytes:
+            # keeping the previous value around would serve outdated data
+            if key in self.cache:
+                self._remove(key)
+            return
+
+        old = self.cache.get(key)
+        self._size += item[2] - (old[2] if old else 0)
+        super()._insert(key, item)
+
+    def _remove(self, key: typing.Any) -> None:
+        """Remove an item."""
+        self._size -= self.cache[key][2]
+        super()._remove(key)
 
 
 class StaticCache(Cache):
     """Cache for only static resources."""
 
-    def __init__(self, ttl: float = DAY) -> None:
-        super().__init__(maxsize=sys.maxsize, ttl=0, static_ttl=ttl)
+    def __init__(
+        self, ttl: float = DAY, *, stale_ttl: float = 0, ttl_policy: typing.Optional[TTLPolicy] = None
+    ) -> None:
+        super().__init__(maxsize=sys.maxsize, ttl=0, static_ttl=ttl, stale_ttl=stale_ttl, ttl_policy=ttl_policy)
 
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Do nothing."""
 
+    async def set_response(
+        self, key: typing.Any, response: typing.Any, raw_body: typing.Optional[bytes], *, static: bool = False
+    ) -> None:
+        """Save a static response with a key, do nothing for other responses."""
+        if static:
+            await super().set_response(key, response, raw_body, static=True)
+
+    async def set_error(self, key: typing.Any, response: typing.Mapping[str, typing.Any]) -> None:
+        """Do nothing."""
+
+
+class TieredCache(BaseCache):
+    """Cache with a small in-memory first tier in front of another cache.
+
+    Writes go through both tiers, items found only in the second tier are promoted to the first one.
+    The first tier never keeps items for longer than its own `ttl`.
+    """
+
+    l1: Cache
+    l2: BaseCache
+
+    l1_hits: int
+    l1_misses: int
+    l2_hits: int
+    l2_misses: int
+
+    def __init__(
+        self,
+        l2: BaseCache,
+        *,
+        maxsize: int = 256,
+        ttl: float = MINUTE,
+        ttl_policy: typing.Optional[TTLPolicy] = None,
+    ) -> None:
+        self.ttl_policy = ttl_policy if ttl_policy is not None else l2.ttl_policy
+        self.l1 = Cache(
+            maxsize, ttl=ttl, static_ttl=ttl, ttl_policy=self.ttl_policy and self.ttl_policy.capped(ttl)
+        )
+        self.l2 = l2
+
+        self.l1_hits = self.l1_misses = 0
+        self.l2_hits = self.l2_misses = 0
+
+    def _count(self, key: typing.Any, l1_value: typing.Any, l2_value: typing.Any = None, stale: bool = False) -> None:
+        """Count hits and misses of a lookup."""
+        self.stats.record_lookup(key, l1_value if l1_value is not None else l2_value, stale=stale)
+
+        if l1_value is not None:
+            self.l1_hits += 1
+            return
+
+        self.l1_misses += 1
+        if l2_value is not None and not stale:
+            self.l2_hits += 1
+        else:
+            self.l2_misses += 1
+
+    async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
+        """Get an object with a key."""
+        if (value := await self.l1.get(key)) is not None:
+            self._count(key, value)
+            return value
+
+        value = await self.l2.get(key)
+        self._count(key, None, value)
+        if value is not None:
+            await self.l1.set(key, value)
+
+        return value
+
+    async def set(self, key: typing.Any, value: typing.Any) -> None:
+        """Save an object with a key."""
+        await self.l1.set(key, value)
+        await self.l2.set(key, value)
+
+    async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
+        """Get a static object with a key."""
+        if (value := await self.l1.get_static(key)) is not None:
+            self._count(key, value)
+            return value
+
+        value = await self.l2.get_static(key)
+        self._count(key, None, value)
+        if value is not None:
+            await self.l1.set_static(key, value)
+
+        return value
+
+    async def set_static(self, key: typing.Any, value: typing.Any) -> None:
+        """Save a static object with a key."""
+        await self.l1.set_static(key, value)
+        await self.l2.set_static(key, value)
+
+    async def set_response(
+        self, key: typing.Any, response: typing.Any, raw_body: typing.Optional[bytes], *, static: bool = False
+    ) -> None:
+        """Save a response with a key in both tiers."""
+        await self.l1.set_response(key, response, raw_body, static=static)
+        await self.l2.set_response(key, response, raw_body, static=static)
+
+    async def get_static_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get a static object with a key and whether it is stale."""
+        if (value := await self.l1.get_static(key)) is not None:
+            self._count(key, value)
+            return value, False
+
+        value, stale = await self.l2.get_static_entry(key)
+        self._count(key, None, value, stale)
+        if value is not None and not stale:
+            await self.l1.set_static(key, value)
+
+        return value, stale
+
+    async def get_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale."""
+        if (value := await self.l1.get(key)) is not None:
+            self._count(key, value)
+            return value, False
+
+        value, stale = await self.l2.get_entry(key)
+        self._count(key, None, value, stale)
+        if value is not None and not stale:
+            await self.l1.set(key, value)
+
+        return value, stale
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> list[typing.Optional[typing.Any]]:
+        """Get several objects with their keys."""
+        values = await self.l1.get_many(keys)
+        missing = [i for i, value in enumerate(values) if value is None]
+        for key, value in zip(keys, values):
+            if value is not None:
+                self._count(key, value)
+
+        if not missing:
+            return values
+
+        l2_values = await self.l2.get_many([keys[i] for i in missing])
+        for i, value in zip(missing, l2_values):
+            self._count(keys[i], None, value)
+            if value is not None:
+                values[i] = value
+                await self.l1.set(keys[i], value)
+
+        return values
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save several objects with their keys."""
+        await self.l1.set_many(items, static=static)
+        await self.l2.set_many(items, static=static)
+
+    @property
+    def error_ttl(self) -> float:  # pyright: ignore[reportIncompatibleVariableOverride]
+        """Time to live of saved errors in the second tier."""
+        return self.l2.error_ttl
+
+    @error_ttl.setter
+    def error_ttl(self, ttl: float) -> None:
+        self.l2.error_ttl = ttl
+
+    async def set_error(self, key: typing.Any, response: typing.Mapping[str, typing.Any]) -> None:
+        """Save the response of an error with a key."""
+        self.l1.error_ttl = min(self.l1.ttl, self.l2.error_ttl)
+        await self.l1.set_error(key, response)
+        await self.l2.set_error(key, response)
+
+    async def invalidate(
+        self,
+        *,
+        prefix: typing.Optional[str] = None,
+        uid: typing.Optional[int] = None,
+        hoyolab_id: typing.Optional[int] = None,
+        game: typing.Optional[types.Game] = None,
+        family: typing.Optional[str] = None,
+    ) -> int:
+        """Remove all objects whose keys match every given filter from both tiers.
+
+        Returns how many objects were removed from the second tier.
+        """
+        await self.l1.invalidate(prefix=prefix, uid=uid, hoyolab_id=hoyolab_id, game=game, family=family)
+        return await self.l2.invalidate(prefix=prefix, uid=uid, hoyolab_id=hoyolab_id, game=game, family=family)
+
 
 class RedisCache(BaseCache):
-    """Redis implementation of the cache."""
+    """Redis implementation of the cache.
+
+    Values are stored as compact json. Values larger than `compression_threshold` bytes are compressed
+    with zlib if a `compression_level` is set, this requires the redis client to not decode responses.
+    Keys are indexed in sorted sets of their tags for invalidation, expired keys are pruned from them on writes.
+    A tag set expires along with its longest-lived key, this requires redis 7.0 or newer.
+    """
 
     redis: aioredis.Redis
     ttl: int
     static_ttl: int
+    stale_ttl: int
+    compression_level: typing.Optional[int]
+    compression_threshold: int
+    json_codec: codec_utility.JSONCodec
 
-    def __init__(self, redis: aioredis.Redis, *, ttl: int = HOUR, static_ttl: int = DAY) -> None:
+    # json values can never start with a control character
+    COMPRESSED_PREFIX: typing.ClassVar[bytes] = b"\x00"
+    RAW_PREFIX: typing.ClassVar[bytes] = b"\x01"
+
+    TAG_PREFIX: typing.ClassVar[str] = "tags:"
+    # tags are sorted sets of keys scored by their expiration timestamp
+    # every command touches a single key so tags also work on a redis cluster
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        *,
+        ttl: int = HOUR,
+        static_ttl: int = DAY,
+        stale_ttl: int = 0,
+        compression_level: typing.Optional[int] = None,
+        compression_threshold: int = 1024,
+        json_codec: typing.Optional[codec_utility.JSONCodec] = None,
+        ttl_policy: typing.Optional[TTLPolicy] = None,
+    ) -> None:
         self.redis = redis
         self.ttl = ttl
         self.static_ttl = static_ttl
+        self.stale_ttl = stale_ttl
+        self.compression_level = compression_level
+        self.compression_threshold = compression_threshold
+        self.json_codec = json_codec or codec_utility.get_default_json_codec()
+        self.ttl_policy = ttl_policy
 
     def serialize_key(self, key: typing.Any) -> str:
         """Serialize a key by turning it into a string."""
         return str(key)
 
-    def serialize_value(self, value: typing.Any) -> typing.Union[str, bytes]:
-        """Serialize a value by turning it into bytes."""
-        return json.dumps(value)
+    def serialize_value(self, value: typing.Any, raw_body: typing.Optional[bytes] = None) -> typing.Union[str, bytes]:
+        """Serialize a value by turning it into bytes.
+
+        Raw response bodies are saved as is instead of the value.
+        """
+        if raw_body is not None:
+            data = self.RAW_PREFIX + raw_body
+        else:
+            data = self.json_codec.dumps(value)
+
+        if self.compression_level is not None and len(data) > self.compression_threshold:
+            return self.COMPRESSED_PREFIX + zlib.compress(data, self.compression_level)
+
+        return data
 
-    def deserialize_value(self, value: bytes) -> typing.Any:
+    def deserialize_value(self, value: typing.Union[str, bytes]) -> typing.Any:
         """Deserialize a value back into data."""
-        return json.loads(value)
+        if isinstance(value, bytes) and value.startswith(self.COMPRESSED_PREFIX):
+            value = zlib.decompress(value[len(self.COMPRESSED_PREFIX) :])
+
+        if isinstance(value, bytes) and value.startswith(self.RAW_PREFIX):
+            return load_response_body(value[len(self.RAW_PREFIX) :], self.json_codec)
+
+        # clients which decode responses return raw bodies as strings
+        if isinstance(value, str) and value.startswith(self.RAW_PREFIX.decode()):
+            return load_response_body(value[len(self.RAW_PREFIX) :], self.json_codec)
+
+        return self.json_codec.loads(value)
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
-        value = typing.cast("typing.Optional[bytes]", await self.redis.get(self.serialize_key(key)))  # pyright: ignore
-        if value is None:
+        if self.stale_ttl:
+            value, stale = await self._get_entry(key)
+            value = None if stale else value
+            self.stats.record_lookup(key, value)
+            return value
+
+        data = typing.cast("typing.Optional[bytes]", await self.redis.get(self.serialize_key(key)))  # pyright: ignore
+        self.stats.record_lookup(key, data)
+        if data is None:
             return None
 
-        return self.deserialize_value(value)
+        return self.deserialize_value(data)
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> list[typing.Optional[typing.Any]]:
+        """Get several objects with their keys in a single round-trip."""
+        if not keys:
+            return []
+
+        serialized_keys = [self.serialize_key(key) for key in keys]
+        if self.stale_ttl:
+            async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+                for key in serialized_keys:
+                    pipe.get(key)  # pyright: ignore
+                    pipe.ttl(key)  # pyright: ignore
+
+                results = typing.cast("list[typing.Any]", await pipe.execute())  # pyright: ignore
+
+            # stale values are treated as missing
+            values = [
+                None if 0 <= remaining <= self.stale_ttl else value
+                for value, remaining in zip(results[::2], results[1::2])
+            ]
+        else:
+            values = typing.cast(
+                "list[typing.Optional[bytes]]", await self.redis.mget(serialized_keys)  # pyright: ignore
+            )
+
+        for key, value in zip(keys, values):
+            self.stats.record_lookup(key, value)
+
+        return [None if value is None else self.deserialize_value(value) for value in values]
+
+    def _serialize_item(
+        self, key: typing.Any, value: typing.Any, raw_body: typing.Optional[bytes] = None
+    ) -> tuple[str, typing.Union[str, bytes]]:
+        """Serialize a key and a value to be saved."""
+        data = self.serialize_value(value, raw_body)
+        self.stats.record_set(key, len(data))
+        return self.serialize_key(key), data
+
+    def _expire(self, key: typing.Any, *, static: bool = False) -> int:
+        """Get the expiration of an item in seconds, items are kept as stale for `stale_ttl` longer."""
+        # redis rejects expirations of 0 which a reset just about to happen would round down to
+        return max(int(self.get_ttl(key, self.static_ttl if static else self.ttl)), 1) + self.stale_ttl
+
+    async def _set(
+        self,
+        items: typing.Iterable[tuple[typing.Any, typing.Any, int]],
+        *,
+        raw_body: typing.Optional[bytes] = None,
+    ) -> None:
+        """Save objects with their expirations and tags in a single round-trip.
+
+        A raw body is only given when saving a single response.
+        """
+        now = int(time.time())
+        # MSET does not support expiration so a pipeline is used instead
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+            for key, value, ex in items:
+                serialized_key, data = self._serialize_item(key, value, raw_body)
+                tags = [self.TAG_PREFIX + tag for tag in key_tags(key)]
+                pipe.set(serialized_key, data, ex=ex)  # pyright: ignore
+                for tag in tags:
+                    pipe.zremrangebyscore(tag, "-inf", now)  # pyright: ignore
+                    pipe.zadd(tag, {serialized_key: now + ex})  # pyright: ignore
+                    # NX covers new sets, GT only ever extends the expiration
+                    pipe.execute_command("EXPIRE", tag, ex, "NX")  # pyright: ignore
+                    pipe.execute_command("EXPIRE", tag, ex, "GT")  # pyright: ignore
+
+            await pipe.execute()  # pyright: ignore
 
     async def set(self, key: typing.Any, value: typing.Any) -> None:
         """Save an object with a key."""
-        await self.redis.set(  # pyright: ignore
-            self.serialize_key(key),
-            self.serialize_value(value),
-            ex=self.ttl,
-        )
+        await self._set([(key, value, self._expire(key))])
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save several objects with their keys in a single round-trip."""
+        if items:
+            await self._set((key, value, self._expire(key, static=static)) for key, value in items.items())
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
         return await self.get(key)
 
+    async def get_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale.
+
+        Objects are stale once their remaining time to live is within `stale_ttl`.
+        """
+        value, stale = await self._get_entry(key)
+        self.stats.record_lookup(key, value, stale=stale)
+        return value, stale
+
+    async def get_static_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get a static object with a key and whether it is stale."""
+        return await self.get_entry(key)
+
+    async def _get_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale without recording statistics."""
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+            pipe.get(self.serialize_key(key))  # pyright: ignore
+            pipe.ttl(self.serialize_key(key))  # pyright: ignore
+            value, remaining = typing.cast("tuple[typing.Optional[bytes], int]", await pipe.execute())  # pyright: ignore
+
+        if value is None:
+            return None, False
+
+        return self.deserialize_value(value), 0 <= remaining <= self.stale_ttl
+
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        await self.redis.set(  # pyright: ignore
-            self.serialize_key(key),
-            self.serialize_value(value),
-            ex=self.static_ttl,
-        )
+        await self._set([(key, value, self._expire(key, static=True))])
+
+    async def set_response(
+        self, key: typing.Any, response: typing.Any, raw_body: typing.Optional[bytes], *, static: bool = False
+    ) -> None:
+        """Save a response with a key, its raw body is saved as is."""
+        await self._set([(key, response, self._expire(key, static=static))], raw_body=raw_body)
+
+    async def set_error(self, key: typing.Any, response: typing.Mapping[str, typing.Any]) -> None:
+        """Save the response of an error with a key for `error_ttl` seconds."""
+        if self.error_ttl > 0:
+            # errors are kept for stale_ttl longer like any item so they are not considered stale right away
+            ex = max(int(self.error_ttl), 1) + self.stale_ttl
+            await self._set([(key, {CACHED_ERROR_KEY: dict(response)}, ex)])
+
+    async def invalidate(
+        self,
+        *,
+        prefix: typing.Optional[str] = None,
+        uid: typing.Optional[int] = None,
+        hoyolab_id: typing.Optional[int] = None,
+        game: typing.Optional[types.Game] = None,
+        family: typing.Optional[str] = None,
+    ) -> int:
+        """Remove all objects whose keys match every given filter and return how many were removed.
+
+        Without any tag filters the keys are scanned for the prefix.
+        """
+        tags = _check_filters(prefix, invalidation_tags(uid=uid, hoyolab_id=hoyolab_id, game=game, family=family))
+        tags = [self.TAG_PREFIX + tag for tag in tags]
+
+        if tags:
+            async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+                for tag in tags:
+                    pipe.zremrangebyscore(tag, "-inf", int(time.time()))  # pyright: ignore
+                    pipe.zrange(tag, 0, -1)  # pyright: ignore
+
+                results = typing.cast("list[typing.Any]", await pipe.execute())  # pyright: ignore
+
+            members = set.intersection(*(set(result) for result in results[1::2]))
+        else:
+            pattern = re.sub(r"([*?\[\]\\])", r"\\\1", typing.cast(str, prefix)) + "*"
+            members = {key async for key in self.redis.scan_iter(match=pattern)}  # pyright: ignore
+
+        keys = [key.decode() if isinstance(key, bytes) else key for key in members]
+        keys = [key for key in keys if not key.startswith(self.TAG_PREFIX) and key.startswith(prefix or "")]
+        if not keys:
+            return 0
+
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore
+            # keys are deleted one by one since they may live in different cluster slots
+            for key in keys:
+                pipe.delete(key)  # pyright: ignore
+            # other tags of the keys are pruned once the keys would have expired
+            for tag in tags:
+                pipe.zrem(tag, *keys)  # pyright: ignore
+
+            results = typing.cast("list[int]", await pipe.execute())  # pyright: ignore
+
+        return sum(results[: len(keys)])
 
 
 class SQLiteCache(BaseCache):
-    """SQLite implementation of the cache."""
+    """SQLite implementation of the cache.
+
+    Without a connection a new one is opened for every operation unless `persistent` is set,
+    in which case a single connection is kept open until `close` is called.
+    Operations on a shared connection are serialized so they never commit each other's writes.
+    Expired items are cleared on writes every `clear_interval`, a persistent connection also clears them
+    in the background so a read-only cache does not grow.
+    """
 
     conn: aiosqlite.Connection | None
     ttl: int
     static_ttl: int
+    stale_ttl: int
+    persistent: bool
+    clear_interval: float
+    json_codec: codec_utility.JSONCodec
+    expirations: int
+    """Number of expired items cleared, sqlite does not know their families."""
+
+    _owns_conn: bool
+    _last_clear: float
+    _lock: typing.Optional[asyncio.Lock]
+    _clear_task: typing.Optional[asyncio.Task[None]]
+
+    # sqlite supports at most 999 variables per statement in older versions
+    MAX_VARIABLES: typing.ClassVar[int] = 900
 
     def __init__(
         self,
@@ -217,87 +1361,236 @@ class SQLiteCache(BaseCache):
         *,
         ttl: int = HOUR,
         static_ttl: int = DAY,
+        stale_ttl: int = 0,
         db_name: str = "genshin_py.db",
+        persistent: bool = False,
+        clear_interval: float = 5 * MINUTE,
+        json_codec: typing.Optional[codec_utility.JSONCodec] = None,
+        ttl_policy: typing.Optional[TTLPolicy] = None,
     ) -> None:
         self.conn = conn
         self.ttl = ttl
         self.static_ttl = static_ttl
+        self.stale_ttl = stale_ttl
         self.db_name = db_name
+        self.persistent = persistent
+        self.clear_interval = clear_interval
+        self.json_codec = json_codec or codec_utility.get_default_json_codec()
+        self.ttl_policy = ttl_policy
+
+        self.expirations = 0
+
+        self._owns_conn = False
+        self._last_clear = 0
+        self._lock = None
+        self._clear_task = None
 
     async def _clear_cache(self, conn: aiosqlite.Connection) -> None:
         """Clear timed-out items."""
         now = time.time()
 
-        await conn.execute("DELETE FROM cache WHERE expiration < ?", (now,))
+        await conn.execute(
+            "DELETE FROM cache_tags WHERE key IN (SELECT key FROM cache WHERE expiration < ?)", (now - self.stale_ttl,)
+        )
+        async with conn.execute("DELETE FROM cache WHERE expiration < ?", (now - self.stale_ttl,)) as cursor:
+            self.expirations += cursor.rowcount
         await conn.commit()
 
-    async def initialize(self) -> None:
-        """Initialize the cache."""
+        self._last_clear = now
+
+    async def _maybe_clear_cache(self, conn: aiosqlite.Connection) -> None:
+        """Clear timed-out items if the clear interval has passed.
+
+        Expired items are never returned so they can be cleared lazily.
+        """
+        if time.time() - self._last_clear >= self.clear_interval:
+            await self._clear_cache(conn)
+
+    async def _clear_periodically(self) -> None:
+        """Clear timed-out items every clear interval while the persistent connection is open."""
+        while True:
+            await asyncio.sleep(self.clear_interval)
+            try:
+                async with self._connect() as conn:
+                    await self._maybe_clear_cache(conn)
+            except Exception:
+                _LOGGER.warning("Failed to clear expired items from the sqlite cache", exc_info=True)
+
+    @contextlib.asynccontextmanager
+    async def _connect(self) -> typing.AsyncIterator[aiosqlite.Connection]:
+        """Acquire a connection for the duration of an operation."""
+        if self.conn is None and not self.persistent:
+            conn = await self._open()
+            try:
+                yield conn
+            finally:
+                await conn.close()
+
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # a shared connection has a single transaction, operations must not interleave
+        async with self._lock:
+            if self.conn is None:
+                self.conn = await self._open()
+                self._owns_conn = True
+                self._clear_task = asyncio.create_task(self._clear_periodically())
+
+            yield self.conn
+
+    async def _open(self) -> aiosqlite.Connection:
+        """Open a new connection."""
         import aiosqlite
 
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
-
-        await conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expiration INTEGER)")
-        await conn.commit()
+        conn = await aiosqlite.connect(self.db_name)
+        # the synchronous setting only applies to the connection it's set on
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
 
-        if self.conn is None:
+    async def initialize(self) -> None:
+        """Initialize the cache."""
+        async with self._connect() as conn:
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expiration INTEGER)"
+            )
+            await conn.execute("CREATE INDEX IF NOT EXISTS cache_expiration ON cache (expiration)")
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT, key TEXT, PRIMARY KEY (tag, key)) WITHOUT ROWID"
+            )
+            await conn.execute("CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key)")
+            await conn.commit()
+
+    async def close(self) -> None:
+        """Close the connection opened by a persistent cache."""
+        if self._clear_task is not None:
+            task, self._clear_task = self._clear_task, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        if self.conn is not None and self._owns_conn:
+            conn, self.conn = self.conn, None
+            self._owns_conn = False
             await conn.close()
 
     def serialize_key(self, key: typing.Any) -> str:
         """Serialize a key by turning it into a string."""
         return str(key)
 
-    def serialize_value(self, value: typing.Any) -> str:
-        """Serialize a value by turning it into a string."""
-        return json.dumps(value)
+    # json values can never start with a control character
+    RAW_PREFIX: typing.ClassVar[str] = "\x01"
+
+    def serialize_value(self, value: typing.Any, raw_body: typing.Optional[bytes] = None) -> str:
+        """Serialize a value by turning it into a string.
+
+        Raw response bodies are saved as is instead of the value.
+        """
+        if raw_body is not None:
+            return self.RAW_PREFIX + raw_body.decode()
+
+        return self.json_codec.dumps(value).decode()
 
     def deserialize_value(self, value: str) -> typing.Any:
         """Deserialize a value back into data."""
-        return json.loads(value)
+        if value.startswith(self.RAW_PREFIX):
+            return load_response_body(value[len(self.RAW_PREFIX) :], self.json_codec)
+
+        return self.json_codec.loads(value)
 
     async def get(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get an object with a key."""
-        import aiosqlite
-
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
-
-        async with conn.execute(
-            "SELECT value FROM cache WHERE key = ? AND expiration > ?", (self.serialize_key(key), int(time.time()))
-        ) as cursor:
-            value = await cursor.fetchone()
-
-        if self.conn is None:
-            await conn.close()
+        async with self._connect() as conn:
+            async with conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expiration > ?", (self.serialize_key(key), int(time.time()))
+            ) as cursor:
+                value = await cursor.fetchone()
 
+        self.stats.record_lookup(key, value)
         if value is None:
             return None
 
         return self.deserialize_value(value[0])
 
-    async def set(self, key: typing.Any, value: typing.Any) -> None:
-        """Save an object with a key."""
-        import aiosqlite
+    async def get_static_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get a static object with a key and whether it is stale."""
+        return await self.get_entry(key)
 
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+    async def get_entry(self, key: typing.Any) -> tuple[typing.Optional[typing.Any], bool]:
+        """Get an object with a key and whether it is stale."""
+        now = int(time.time())
 
-        await conn.execute(
-            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
-            (self.serialize_key(key), self.serialize_value(value), int(time.time() + self.ttl)),
-        )
-        await conn.commit()
-        await self._clear_cache(conn)
+        async with self._connect() as conn:
+            async with conn.execute(
+                "SELECT value, expiration FROM cache WHERE key = ? AND expiration > ?",
+                (self.serialize_key(key), now - self.stale_ttl),
+            ) as cursor:
+                row = await cursor.fetchone()
 
-        if self.conn is None:
-            await conn.close()
+        if row is None:
+            self.stats.record_lookup(key, None)
+            return None, False
+
+        self.stats.record_lookup(key, row, stale=row[1] <= now)
+        return self.deserialize_value(row[0]), row[1] <= now
+
+    async def get_many(self, keys: typing.Sequence[typing.Any]) -> list[typing.Optional[typing.Any]]:
+        """Get several objects with their keys."""
+        serialized_keys = [self.serialize_key(key) for key in keys]
+        values: dict[str, typing.Any] = {}
+
+        async with self._connect() as conn:
+            for i in range(0, len(serialized_keys), self.MAX_VARIABLES):
+                chunk = serialized_keys[i : i + self.MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                # only placeholders are formatted into the query
+                query = f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expiration > ?"  # noqa: S608
+                async with conn.execute(query, (*chunk, int(time.time()))) as cursor:
+                    values.update((row[0], row[1]) for row in await cursor.fetchall())
+
+        for key, serialized_key in zip(keys, serialized_keys):
+            self.stats.record_lookup(key, values.get(serialized_key))
+
+        return [self.deserialize_value(values[key]) if key in values else None for key in serialized_keys]
+
+    async def _set(
+        self,
+        items: typing.Mapping[typing.Any, typing.Any],
+        ttl: float,
+        *,
+        policy: bool = True,
+        raw_body: typing.Optional[bytes] = None,
+    ) -> None:
+        """Save objects with a default ttl in a single transaction.
+
+        A raw body is only given when saving a single response.
+        """
+        now = time.time()
+        rows: list[tuple[str, str, int]] = []
+        tags: list[tuple[str, str]] = []
+        for key, value in items.items():
+            data = self.serialize_value(value, raw_body)
+            self.stats.record_set(key, len(data))
+            serialized_key = self.serialize_key(key)
+            rows.append((serialized_key, data, int(now + (self.get_ttl(key, ttl) if policy else ttl))))
+            tags.extend((tag, serialized_key) for tag in key_tags(key))
+
+        async with self._connect() as conn:
+            await conn.executemany("INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)", rows)
+            await conn.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", tags)
+            await conn.commit()
+            await self._maybe_clear_cache(conn)
+
+    async def set(self, key: typing.Any, value: typing.Any) -> None:
+        """Save an object with a key."""
+        await self._set({key: value}, self.ttl)
+
+    async def set_many(self, items: typing.Mapping[typing.Any, typing.Any], *, static: bool = False) -> None:
+        """Save several objects with their keys."""
+        await self._set(items, self.static_ttl if static else self.ttl)
 
     async def get_static(self, key: typing.Any) -> typing.Optional[typing.Any]:
         """Get a static object with a key."""
@@ -305,19 +1598,51 @@ class SQLiteCache(BaseCache):
 
     async def set_static(self, key: typing.Any, value: typing.Any) -> None:
         """Save a static object with a key."""
-        import aiosqlite
+        await self._set({key: value}, self.static_ttl)
 
-        if self.conn is None:
-            conn = await aiosqlite.connect(self.db_name)
-        else:
-            conn = self.conn
+    async def set_response(
+        self, key: typing.Any, response: typing.Any, raw_body: typing.Optional[bytes], *, static: bool = False
+    ) -> None:
+        """Save a response with a key, its raw body is saved as is."""
+        await self._set({key: response}, self.static_ttl if static else self.ttl, raw_body=raw_body)
 
-        await conn.execute(
-            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
-            (self.serialize_key(key), self.serialize_value(value), int(time.time() + self.static_ttl)),
-        )
-        await conn.commit()
-        await self._clear_cache(conn)
+    async def set_error(self, key: typing.Any, response: typing.Mapping[str, typing.Any]) -> None:
+        """Save the response of an error with a key for `error_ttl` seconds."""
+        if self.error_ttl > 0:
+            await self._set({key: {CACHED_ERROR_KEY: dict(response)}}, self.error_ttl, policy=False)
 
-        if self.conn is None:
-            await conn.close()
+    async def invalidate(
+        self,
+        *,
+        prefix: typing.Optional[str] = None,
+        uid: typing.Optional[int] = None,
+        hoyolab_id: typing.Optional[int] = None,
+        game: typing.Optional[types.Game] = None,
+        family: typing.Optional[str] = None,
+    ) -> int:
+        """Remove all objects whose keys match every given filter and return how many were removed."""
+        tags = _check_filters(prefix, invalidation_tags(uid=uid, hoyolab_id=hoyolab_id, game=game, family=family))
+
+        queries = ["SELECT key FROM cache_tags WHERE tag = ?"] * len(tags)
+        params: list[typing.Any] = [*tags]
+        if prefix is not None:
+            queries.append("SELECT key FROM cache WHERE substr(key, 1, ?) = ?")
+            params += [len(prefix), prefix]
+
+        async with self._connect() as conn:
+            async with conn.execute(" INTERSECT ".join(queries), params) as cursor:
+                keys = [key for (key,) in await cursor.fetchall()]
+
+            removed = 0
+            for i in range(0, len(keys), self.MAX_VARIABLES):
+                chunk = keys[i : i + self.MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                # only placeholders are formatted into the queries
+                query = f"DELETE FROM cache WHERE key IN ({placeholders})"  # noqa: S608
+                async with conn.execute(query, chunk) as cursor:
+                    removed += cursor.rowcount
+                await conn.execute(f"DELETE FROM cache_tags WHERE key IN ({placeholders})", chunk)  # noqa: S608
+
+            await conn.commit()
+
+        return removed
@@ -139,7 +139,7 @@ class AuthClient(subclients.AppAuthClient, subclients.WebAuthClient, subclients.
 
         Returns True if the mobile number is valid, False otherwise.
         """
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.get(
                 routes.CHECK_MOBILE_VALIDITY_URL.get_url(),
                 params={"mobile": mobile},
@@ -276,7 +276,7 @@ class AuthClient(subclients.AppAuthClient, subclients.WebAuthClient, subclients.
             url = url.update_query(app_key=constants.GEETEST_RECORD_KEYS[self.default_game])
 
         assert isinstance(self.cookie_manager, managers.CookieManager)
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.get(url, headers=headers, cookies=self.cookie_manager.cookies) as r:
                 data = await r.json()
 
@@ -301,7 +301,7 @@ class AuthClient(subclients.AppAuthClient, subclients.WebAuthClient, subclients.
         body["app_key"] = constants.GEETEST_RECORD_KEYS[self.default_game]
 
         assert isinstance(self.cookie_manager, managers.CookieManager)
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.post(
                 routes.VERIFY_MMT_URL.get_url(), json=body, headers=headers, cookies=self.cookie_manager.cookies
             ) as r:
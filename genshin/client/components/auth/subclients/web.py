@@ -66,7 +66,7 @@ class WebAuthClient(base.BaseClient):
             "token_type": token_type,
         }
 
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.post(
                 routes.WEB_LOGIN_URL.get_url(),
                 json=payload,
@@ -135,7 +135,7 @@ class WebAuthClient(base.BaseClient):
             "password": password if encrypted else auth_utility.encrypt_credentials(password, 2),
         }
 
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.post(
                 routes.CN_WEB_LOGIN_URL.get_url(),
                 json=payload,
@@ -179,7 +179,7 @@ class WebAuthClient(base.BaseClient):
             "area_code": auth_utility.encrypt_credentials("+86", 2),
         }
 
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.post(
                 routes.MOBILE_OTP_URL.get_url(),
                 json=payload,
@@ -213,7 +213,7 @@ class WebAuthClient(base.BaseClient):
             "captcha": otp,
         }
 
-        async with self.cookie_manager.create_session() as session:
+        async with self.cookie_manager.acquire_session() as session:
             async with session.post(
                 routes.MOBILE_LOGIN_URL.get_url(),
                 json=payload,
@@ -1,9 +1,10 @@
 """Base ABC Client."""
 
 import abc
+import asyncio
 import base64
 import functools
-import json
+import inspect
 import logging
 import os
 import typing
@@ -12,11 +13,13 @@ import warnings
 
 import aiohttp.typedefs
 import multidict
+import pydantic
 import yarl
 
 from genshin import constants, errors, types, utility
 from genshin.client import cache as client_cache
-from genshin.client import routes
+from genshin.client import ratelimit, routes
+from genshin.client import scheduler as client_scheduler
 from genshin.client.manager import managers
 from genshin.models import hoyolab as hoyolab_models
 from genshin.utility import concurrency, deprecation, ds
@@ -28,6 +31,7 @@ __all__ = ["BaseClient"]
 T = typing.TypeVar("T")
 CallableT = typing.TypeVar("CallableT", bound="typing.Callable[..., object]")
 AsyncCallableT = typing.TypeVar("AsyncCallableT", bound="typing.Callable[..., typing.Awaitable[object]]")
+ClientT = typing.TypeVar("ClientT", bound="BaseClient")
 
 
 def parse_loose_headers(
@@ -41,7 +45,7 @@ class BaseClient(abc.ABC):
     """Base ABC Client."""
 
     __slots__ = (
-        "cookie_manager",
+        "_cookie_manager",
         "cache",
         "_lang",
         "_region",
@@ -51,14 +55,29 @@ class BaseClient(abc.ABC):
         "_hoyolab_id",
         "_accounts",
         "custom_headers",
+        "_inflight_requests",
+        "model_cache",
+        "hedging",
+        "_previous_keep_alive",
     )
 
+    stale_while_revalidate: bool = True
+    """Whether stale static objects are returned right away while they are refreshed in the background.
+
+    Otherwise the refresh is awaited and stale objects are only returned if it fails.
+    """
+    cache_policy: client_cache.CachePolicy = client_cache.CachePolicy.CACHE_FIRST
+    """Default cache policy of requests, overridden by `use_cache_policy` and the `cache_policy` argument."""
+    cached_errors: tuple[type[errors.GenshinException], ...] = (errors.DataNotPublic, errors.AccountNotFound)
+    """Errors saved in the cache for `cache.error_ttl` seconds and reraised for the same cache key."""
+
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"  # noqa: E501
 
     logger: logging.Logger = logging.getLogger(__name__)
 
-    cookie_manager: managers.BaseCookieManager
+    _cookie_manager: managers.BaseCookieManager
     cache: client_cache.BaseCache
+    model_cache: typing.Optional[client_cache.Cache]
     _lang: str
     _region: types.Region
     _default_game: typing.Optional[types.Game]
@@ -68,6 +87,9 @@ class BaseClient(abc.ABC):
     _hoyolab_id: typing.Optional[int]
     _accounts: dict[types.Game, hoyolab_models.GenshinAccount]
     custom_headers: multidict.CIMultiDict[str]
+    _inflight_requests: concurrency.SingleFlight
+    hedging: typing.Optional[concurrency.Hedging]
+    _previous_keep_alive: bool
 
     def __init__(
         self,
@@ -84,14 +106,37 @@ class BaseClient(abc.ABC):
         device_fp: typing.Optional[str] = None,
         headers: typing.Optional[aiohttp.typedefs.LooseHeaders] = None,
         cache: typing.Optional[client_cache.BaseCache] = None,
+        model_cache: typing.Optional[client_cache.Cache] = None,
         debug: bool = False,
+        keep_alive: bool = False,
+        connection_config: typing.Optional[managers.ConnectionConfig] = None,
+        json_codec: typing.Optional[utility.JSONCodec] = None,
+        rate_limiter: typing.Optional[ratelimit.RateLimiter] = None,
+        concurrency_limiter: typing.Optional[ratelimit.AdaptiveConcurrencyLimiter] = None,
+        circuit_breaker: typing.Optional[ratelimit.CircuitBreaker] = None,
+        retry_budget: typing.Optional[ratelimit.RetryBudget] = None,
+        hedging: typing.Optional[concurrency.Hedging] = None,
+        scheduler: typing.Optional[client_scheduler.RequestScheduler] = None,
     ) -> None:
-        self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies)
-        self.cache = cache or client_cache.StaticCache()
+        self._cookie_manager = managers.BaseCookieManager.from_cookies(cookies)
+        self.cookie_manager.keep_alive = keep_alive
+        self._previous_keep_alive = keep_alive
+        self.cookie_manager.json_codec = json_codec
+        self.cookie_manager.rate_limiter = rate_limiter
+        self.cookie_manager.concurrency_limiter = concurrency_limiter
+        self.cookie_manager.circuit_breaker = circuit_breaker
+        self.cookie_manager.retry_budget = retry_budget
+        self.cookie_manager.scheduler = scheduler
+        if connection_config is not None:
+            self.cookie_manager.connection_config = connection_config
+        self.cache = cache if cache is not None else client_cache.StaticCache()
+        self.model_cache = model_cache
+        self.hedging = hedging
 
         self.uids = {}
         self.authkeys = {}
         self._accounts = {}
+        self._inflight_requests = concurrency.SingleFlight()
 
         self.default_game = game
         self.lang = lang
@@ -119,6 +164,32 @@ class BaseClient(abc.ABC):
         )
         return f"<{type(self).__name__} {', '.join(f'{k}={v!r}' for k, v in kwargs.items() if v)}>"
 
+    async def __aenter__(self: ClientT) -> ClientT:
+        self._previous_keep_alive = self.cookie_manager.keep_alive
+        self.cookie_manager.keep_alive = True
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        # requests made after the block must not create a session nobody closes
+        self.cookie_manager.keep_alive = self._previous_keep_alive
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled http session used with keep-alive."""
+        await self.cookie_manager.close()
+
+    @property
+    def cookie_manager(self) -> managers.BaseCookieManager:
+        """The cookie manager making requests.
+
+        A replaced cookie manager keeps the session, connection and ratelimit configuration of the previous one.
+        """
+        return self._cookie_manager
+
+    @cookie_manager.setter
+    def cookie_manager(self, cookie_manager: managers.BaseCookieManager) -> None:
+        self._replace_cookie_manager(cookie_manager)
+
     @property
     def device_id(self) -> typing.Optional[str]:
         """The device id used in headers."""
@@ -262,14 +333,35 @@ class BaseClient(abc.ABC):
         if not bool(cookies) ^ bool(kwargs):
             raise TypeError("Cannot use both positional and keyword arguments at once")
 
-        self.cookie_manager = managers.BaseCookieManager.from_cookies(cookies or kwargs)
+        self._replace_cookie_manager(managers.BaseCookieManager.from_cookies(cookies or kwargs))
 
     def set_browser_cookies(self, browser: typing.Optional[str] = None) -> None:
         """Extract cookies from your browser and set them as client cookies.
 
         Available browsers: chrome, chromium, opera, edge, firefox.
         """
-        self.cookie_manager = managers.BaseCookieManager.from_browser_cookies(browser)
+        self._replace_cookie_manager(managers.BaseCookieManager.from_browser_cookies(browser))
+
+    def _replace_cookie_manager(self, cookie_manager: managers.BaseCookieManager) -> None:
+        """Replace the cookie manager while keeping its pooled session."""
+        old = self.cookie_manager
+        if cookie_manager is old:
+            return
+
+        cookie_manager.keep_alive = old.keep_alive
+        cookie_manager.connection_config = old.connection_config
+        cookie_manager.json_codec = old._json_codec
+        cookie_manager.rate_limiter = old.rate_limiter
+        cookie_manager.concurrency_limiter = old.concurrency_limiter
+        cookie_manager.circuit_breaker = old.circuit_breaker
+        cookie_manager.retry_budget = old.retry_budget
+        cookie_manager.scheduler = old.scheduler
+
+        # the pooled session is owned by the new manager only, closing the old one must not close it
+        cookie_manager._session, old._session = old._session, None
+        cookie_manager._session_socks_proxy, old._session_socks_proxy = old._session_socks_proxy, None
+        cookie_manager._session_usage, old._session_usage = old._session_usage, None
+        self._cookie_manager = cookie_manager
 
     def set_authkey(self, authkey: typing.Optional[str] = None, *, game: typing.Optional[types.Game] = None) -> None:
         """Set an authkey for wish & transaction logs.
@@ -288,19 +380,68 @@ class BaseClient(abc.ABC):
         self.authkeys[game] = authkey
 
     def set_cache(
-        self, maxsize: int = 1024, *, ttl: int = client_cache.HOUR, static_ttl: int = client_cache.DAY
+        self,
+        maxsize: int = 1024,
+        *,
+        ttl: int = client_cache.HOUR,
+        static_ttl: int = client_cache.DAY,
+        ttl_policy: typing.Optional[client_cache.TTLPolicy] = None,
     ) -> None:
         """Create and set a new cache."""
-        self.cache = client_cache.Cache(maxsize, ttl=ttl, static_ttl=static_ttl)
+        self.cache = client_cache.Cache(maxsize, ttl=ttl, static_ttl=static_ttl, ttl_policy=ttl_policy)
 
     def set_redis_cache(
-        self, url: str, *, ttl: int = client_cache.HOUR, static_ttl: int = client_cache.DAY, **redis_kwargs: typing.Any
+        self,
+        url: str,
+        *,
+        ttl: int = client_cache.HOUR,
+        static_ttl: int = client_cache.DAY,
+        compression_level: typing.Optional[int] = None,
+        ttl_policy: typing.Optional[client_cache.TTLPolicy] = None,
+        **redis_kwargs: typing.Any,
     ) -> None:
         """Create and set a new redis cache."""
         import aioredis
 
         redis = aioredis.Redis.from_url(url, **redis_kwargs)  # pyright: ignore[reportUnknownMemberType]
-        self.cache = client_cache.RedisCache(redis, ttl=ttl, static_ttl=static_ttl)
+        self.cache = client_cache.RedisCache(
+            redis,
+            ttl=ttl,
+            static_ttl=static_ttl,
+            compression_level=compression_level,
+            json_codec=self.cookie_manager.json_codec,
+            ttl_policy=ttl_policy,
+        )
+
+    async def invalidate_cache(
+        self,
+        *,
+        prefix: typing.Optional[str] = None,
+        uid: typing.Optional[int] = None,
+        hoyolab_id: typing.Optional[int] = None,
+        game: typing.Optional[types.Game] = None,
+        family: typing.Optional[str] = None,
+    ) -> None:
+        """Remove cached objects whose keys match every given filter.
+
+        Parsed models in the model cache are removed by uid and game only.
+        """
+        await self.cache.invalidate(prefix=prefix, uid=uid, hoyolab_id=hoyolab_id, game=game, family=family)
+
+        if self.model_cache is not None and (uid is not None or game is not None):
+            await self.model_cache.invalidate(uid=uid, game=game)
+
+    async def _invalidate_account_cache(self, game: types.Game, *, family: typing.Optional[str] = None) -> None:
+        """Remove cached objects of the account of a game after changing it.
+
+        Nothing is removed if the uid of the account cannot be found, rather than the objects of every account.
+        """
+        try:
+            uid = await self._get_uid(game)
+        except (RuntimeError, errors.GenshinException):
+            return
+
+        await self.invalidate_cache(uid=uid, game=game, family=family)
 
     @property
     def proxy(self) -> typing.Optional[str]:
@@ -314,6 +455,15 @@ class BaseClient(abc.ABC):
     def proxy(self, proxy: typing.Optional[aiohttp.typedefs.StrOrURL]) -> None:
         self.cookie_manager.proxy = yarl.URL(proxy) if proxy else None
 
+    @property
+    def scheduler(self) -> typing.Optional[client_scheduler.RequestScheduler]:
+        """Scheduler letting interactive requests through before background ones."""
+        return self.cookie_manager.scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler: typing.Optional[client_scheduler.RequestScheduler]) -> None:
+        self.cookie_manager.scheduler = scheduler
+
     async def _request_hook(
         self,
         method: str,
@@ -332,8 +482,8 @@ class BaseClient(abc.ABC):
             params = {k: v for k, v in params.items() if k != "authkey"}
             url = url.update_query(params)
 
-        if data:
-            self.logger.debug("%s %s\n%s", method, url, json.dumps(data, separators=(",", ":")))
+        if data and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s %s\n%s", method, url, self.cookie_manager.json_codec.dumps(data).decode())
         else:
             self.logger.debug("%s %s", method, url)
 
@@ -347,20 +497,141 @@ class BaseClient(abc.ABC):
         headers: typing.Optional[aiohttp.typedefs.LooseHeaders] = None,
         cache: typing.Any = None,
         static_cache: typing.Any = None,
+        error_cache: typing.Any = None,
+        cache_policy: typing.Optional[client_cache.CachePolicy] = None,
+        hedge: typing.Optional[bool] = None,
+        priority: typing.Optional[client_scheduler.Priority] = None,
         **kwargs: typing.Any,
     ) -> typing.Mapping[str, typing.Any]:
-        """Make a request and return a parsed json response."""
-        if cache is not None:
-            value = await self.cache.get(cache)
-            if value is not None:
-                return value
-        elif static_cache is not None:
-            value = await self.cache.get_static(static_cache)
-            if value is not None:
-                return value
-
-        # actual request
+        """Make a request and return a parsed json response.
+
+        Errors in `client.cached_errors` are saved with `error_cache`, `cache` by default,
+        even when successful responses are not cached.
+        With `client.hedging` GET requests are hedged unless `hedge` is False, other requests only if it is True.
+        """
+        policy = self._get_cache_policy(cache_policy)
+        key = cache if cache is not None else static_cache
+        error_key = cache if cache is not None else error_cache
+
+        value, stale = await self._read_cache(key, static=cache is None, policy=policy)
+        if key is None and error_key is not None and policy != client_cache.CachePolicy.NETWORK_ONLY:
+            self._check_cached_error(await self.cache.get(error_key))
+
+        if value is not None and (not stale or policy == client_cache.CachePolicy.CACHE_ONLY):
+            return self._check_cached_error(value)
+
+        if policy == client_cache.CachePolicy.CACHE_ONLY:
+            raise errors.CacheMiss
+
+        if "json" in kwargs:
+            raise TypeError("Use data instead of json in request.")
+
+        async def fetch() -> typing.Mapping[str, typing.Any]:
+            try:
+                response, raw_body = await self._send_request(
+                    url,
+                    method=method,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    hedge=hedge,
+                    priority=priority,
+                    return_body=True,
+                    **kwargs,
+                )
+            except self.cached_errors as e:
+                if error_key is not None:
+                    await self.cache.set_error(error_key, e.response)
+                raise
+
+            # the raw body is only handed to the cache, it's never kept beside the response
+            if cache is not None:
+                await self.cache.set_response(cache, response, raw_body)
+            elif static_cache is not None:
+                await self.cache.set_response(static_cache, response, raw_body, static=True)
+
+            return response
+
+        if key is None:
+            return await fetch()
+
+        if value is not None:
+            # only static objects are refreshed in the background, others must not outlive their ttl
+            background = cache is None and policy == client_cache.CachePolicy.CACHE_FIRST
+            return self._check_cached_error(await self._revalidate(key, fetch, value, background=background))
+
+        # concurrent identical requests share a single round-trip
+        return await self._inflight_requests.run(key, fetch)
+
+    def _get_cache_policy(self, policy: typing.Optional[client_cache.CachePolicy] = None) -> client_cache.CachePolicy:
+        """Resolve the cache policy of a request."""
+        policy = policy or client_cache.get_cache_policy() or self.cache_policy
+        return client_cache.CachePolicy(policy)
+
+    async def _read_cache(
+        self, key: typing.Any, *, static: bool, policy: client_cache.CachePolicy
+    ) -> tuple[typing.Optional[typing.Any], bool]:
+        """Read an object and whether it is stale from the cache as allowed by the cache policy."""
+        if key is None or policy == client_cache.CachePolicy.NETWORK_ONLY:
+            return None, False
+
+        if static:
+            return await self.cache.get_static_entry(key)
+
+        if policy == client_cache.CachePolicy.CACHE_FIRST:
+            return await self.cache.get(key), False
+
+        return await self.cache.get_entry(key)
+
+    def _check_cached_error(self, value: T) -> T:
+        """Reraise an error saved by the cache."""
+        response = client_cache.get_cached_error(value)
+        if response is not None:
+            errors.raise_for_retcode(dict(response))
+
+        return value
+
+    async def _revalidate(
+        self,
+        key: typing.Any,
+        fetch: typing.Callable[[], typing.Awaitable[T]],
+        stale_value: T,
+        *,
+        background: bool = True,
+    ) -> T:
+        """Refresh a stale object, falling back to the stale object on errors."""
+        if background and self.stale_while_revalidate:
+            future = self._inflight_requests.start(key, fetch)
+            future.add_done_callback(functools.partial(self._log_failed_revalidation, key))
+            return stale_value
+
+        try:
+            return await self._inflight_requests.run(key, fetch)
+        except Exception as e:
+            self.logger.warning("Failed to refresh %s, using stale data: %r", key, e)
+            return stale_value
+
+    def _log_failed_revalidation(self, key: typing.Any, future: asyncio.Future[typing.Any]) -> None:
+        """Log the error of a failed background refresh."""
+        if not future.cancelled() and (e := future.exception()) is not None:
+            self.logger.warning("Failed to refresh %s in the background: %r", key, e)
 
+    async def _send_request(
+        self,
+        url: aiohttp.typedefs.StrOrURL,
+        *,
+        method: typing.Optional[str] = None,
+        params: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        data: typing.Any = None,
+        headers: typing.Optional[aiohttp.typedefs.LooseHeaders] = None,
+        hedge: typing.Optional[bool] = None,
+        priority: typing.Optional[client_scheduler.Priority] = None,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Make an uncached request and return a parsed json response.
+
+        With `return_body` the raw body of the response is returned beside the parsed response.
+        """
         headers = parse_loose_headers(headers)
         headers["User-Agent"] = self.USER_AGENT
         headers.update(self.custom_headers)
@@ -368,23 +639,41 @@ class BaseClient(abc.ABC):
         if method is None:
             method = "POST" if data else "GET"
 
-        if "json" in kwargs:
-            raise TypeError("Use data instead of json in request.")
-
         await self._request_hook(method, url, params=params, data=data, headers=headers, **kwargs)
 
-        response = await self.cookie_manager.request(
-            url, method=method, params=params, json=data, headers=headers, **kwargs
-        )
-
-        # cache
+        hedging = self.hedging
+        if hedging is None or not (hedge or (hedge is None and method == "GET")):
+            return await self.cookie_manager.request(
+                url, method=method, params=params, json=data, headers=headers, priority=priority, **kwargs
+            )
 
-        if cache is not None:
-            await self.cache.set(cache, response)
-        elif static_cache is not None:
-            await self.cache.set_static(static_cache, response)
+        async def send(hedged: bool) -> typing.Mapping[str, typing.Any]:
+            proxy_kwargs: dict[str, typing.Any] = dict(proxy=hedging.proxy) if hedged and hedging.proxy else {}
+            if hedged and hedging.cookies:
+                return await self.cookie_manager._request(
+                    method,
+                    url,
+                    cookies=managers.parse_cookie(hedging.cookies),
+                    params=params,
+                    json=data,
+                    headers=headers,
+                    priority=priority,
+                    **proxy_kwargs,
+                    **kwargs,
+                )
+
+            return await self.cookie_manager.request(
+                url,
+                method=method,
+                params=params,
+                json=data,
+                headers=headers,
+                priority=priority,
+                **proxy_kwargs,
+                **kwargs,
+            )
 
-        return response
+        return await hedging.run(send)
 
     async def request_webstatic(
         self,
@@ -393,13 +682,18 @@ class BaseClient(abc.ABC):
         headers: typing.Optional[aiohttp.typedefs.LooseHeaders] = None,
         cache: typing.Any = None,
         region: types.Region = types.Region.OVERSEAS,
+        cache_policy: typing.Optional[client_cache.CachePolicy] = None,
         **kwargs: typing.Any,
     ) -> typing.Any:
         """Request a static json file."""
-        if cache is not None:
-            value = await self.cache.get_static(cache)
-            if value is not None:
-                return value
+        policy = self._get_cache_policy(cache_policy)
+        value, stale = await self._read_cache(cache, static=True, policy=policy)
+        value, validators = client_cache.split_validators(value)
+        if value is not None and (not stale or policy == client_cache.CachePolicy.CACHE_ONLY):
+            return value
+
+        if policy == client_cache.CachePolicy.CACHE_ONLY:
+            raise errors.CacheMiss
 
         url = routes.WEBSTATIC_URL.get_url(region).join(yarl.URL(url))
 
@@ -407,17 +701,37 @@ class BaseClient(abc.ABC):
         headers["User-Agent"] = self.USER_AGENT
         headers.update(self.custom_headers)
 
-        await self._request_hook("GET", url, headers=headers, **kwargs)
+        # stale files are only downloaded again if they changed
+        # without a stale_ttl the previous file is gone by then and it's always downloaded
+        if value is not None:
+            headers.update(utility.get_conditional_headers(validators))
 
-        async with self.cookie_manager.create_session() as session:
-            async with session.get(url, headers=headers, proxy=self.proxy, **kwargs) as r:
-                r.raise_for_status()
-                data = await r.json()
+        async def fetch() -> typing.Any:
+            await self._request_hook("GET", url, headers=headers, **kwargs)
 
-        if cache is not None:
-            await self.cache.set_static(cache, data)
+            async with self.cookie_manager.acquire_session() as session:
+                async with session.get(url, headers=headers, proxy=self.proxy, **kwargs) as r:
+                    r.raise_for_status()
+                    if r.status == 304:
+                        data = value
+                    else:
+                        data = self.cookie_manager.json_codec.loads(await r.read())
 
-        return data
+                    response_validators = utility.get_validators(r.headers) or validators
+
+            if cache is not None:
+                await self.cache.set_static(cache, client_cache.with_validators(data, response_validators))
+
+            return data
+
+        if cache is None:
+            return await fetch()
+
+        if value is not None:
+            background = policy == client_cache.CachePolicy.CACHE_FIRST
+            return await self._revalidate(cache, fetch, value, background=background)
+
+        return await self._inflight_requests.run(cache, fetch)
 
     async def request_bbs(
         self,
@@ -610,3 +924,89 @@ def region_specific(region: types.Region) -> typing.Callable[[AsyncCallableT], A
         return typing.cast("AsyncCallableT", wrapper)
 
     return decorator
+
+
+_frozen_model_classes: dict[type[pydantic.BaseModel], type[pydantic.BaseModel]] = {}
+
+
+def _frozen_model_class(cls: type[pydantic.BaseModel]) -> type[pydantic.BaseModel]:
+    """Get a frozen subclass of a model class which keeps its name and hash."""
+    frozen = _frozen_model_classes.get(cls)
+    if frozen is None:
+        namespace = {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__hash__": cls.__hash__,
+            "model_config": pydantic.ConfigDict(frozen=True),
+        }
+        frozen = _frozen_model_classes[cls] = type(cls.__name__, (cls,), namespace)
+
+    return frozen
+
+
+def _freeze_models(value: typing.Any) -> None:
+    """Freeze all models in a value in place so their fields can't be reassigned."""
+    if isinstance(value, pydantic.BaseModel):
+        if not value.model_config.get("frozen"):
+            object.__setattr__(value, "__class__", _frozen_model_class(type(value)))
+        items: typing.Iterable[typing.Any] = value.__dict__.values()
+    elif isinstance(value, typing.Mapping):
+        items = typing.cast("typing.Mapping[typing.Any, typing.Any]", value).values()
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = typing.cast("typing.Iterable[typing.Any]", value)
+    else:
+        return
+
+    for item in items:
+        _freeze_models(item)
+
+
+def cached_model(game: types.Game) -> typing.Callable[[AsyncCallableT], AsyncCallableT]:
+    """Cache the parsed models returned by a method of a game in the client's in-process model cache.
+
+    Cached models are frozen and lists of them are turned into tuples, so callers can share them.
+    """
+
+    def decorator(func: AsyncCallableT) -> AsyncCallableT:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self: typing.Any, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if not hasattr(self, "model_cache"):
+                raise TypeError("Cannot use @cached_model on a plain function.")
+
+            model_cache: typing.Optional[client_cache.Cache] = self.model_cache
+            if model_cache is None or kwargs.get("raw") or kwargs.get("return_raw_data"):
+                return await func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+
+            key = client_cache.cache_key(
+                "model",
+                method=func.__name__,
+                arguments=tuple((name, value) for name, value in arguments.items() if name != "uid"),
+                game=game,
+                # passed and default uids share a key, it's also used to invalidate models of a user
+                uid=arguments.get("uid") or self.uids.get(game),
+                hoyolab_id=self.hoyolab_id,
+                region=self.region,
+                lang=self.lang,
+            )
+            policy = self._get_cache_policy()
+            if policy != client_cache.CachePolicy.NETWORK_ONLY and (model := await model_cache.get(key)) is not None:
+                return model
+
+            model = await func(self, *args, **kwargs)
+            if isinstance(model, list):
+                model = tuple(typing.cast("list[typing.Any]", model))
+
+            _freeze_models(model)
+            await model_cache.set(key, model)
+            return model
+
+        return typing.cast("AsyncCallableT", wrapper)
+
+    return decorator
@@ -143,6 +143,7 @@ class CalculatorClient(base.BaseClient):
 
         return data["list"]
 
+    @base.cached_model(types.Game.GENSHIN)
     async def get_calculator_characters(
         self,
         *,
@@ -169,6 +170,7 @@ class CalculatorClient(base.BaseClient):
         )
         return [models.CalculatorCharacter(**i) for i in data]
 
+    @base.cached_model(types.Game.GENSHIN)
     async def get_calculator_weapons(
         self,
         *,
@@ -189,6 +191,7 @@ class CalculatorClient(base.BaseClient):
         )
         return [models.CalculatorWeapon(**i) for i in data]
 
+    @base.cached_model(types.Game.GENSHIN)
     async def get_calculator_artifacts(
         self,
         *,
@@ -209,6 +212,7 @@ class CalculatorClient(base.BaseClient):
         )
         return [models.CalculatorArtifact(**i) for i in data]
 
+    @base.cached_model(types.Game.GENSHIN)
     async def get_calculator_furnishings(
         self,
         *,
@@ -16,17 +16,27 @@ from genshin.utility import deprecation
 __all__ = ["BaseBattleChronicleClient"]
 
 
-@dataclasses.dataclass(unsafe_hash=True)
+@cache.with_slots
+@dataclasses.dataclass(frozen=True, eq=False)
 class HoyolabCacheKey(cache.CacheKey):
     endpoint: str
     hoyolab_id: int
     lang: str
 
+    @property
+    def family(self) -> str:
+        return self.endpoint
 
-@dataclasses.dataclass(unsafe_hash=True)
+
+@cache.with_slots
+@dataclasses.dataclass(frozen=True, eq=False)
 class ChronicleCacheKey(cache.CacheKey):
-    def __str__(self) -> str:
-        return "chronicle" + ":" + super().__str__()
+    def _to_str(self) -> str:
+        return "chronicle" + ":" + cache.CacheKey._to_str(self)
+
+    @property
+    def family(self) -> str:
+        return "chronicle:" + self.endpoint
 
     game: types.Game
     endpoint: str
@@ -38,6 +48,11 @@ class ChronicleCacheKey(cache.CacheKey):
 class BaseBattleChronicleClient(base.BaseClient):
     """Base battle chronicle component."""
 
+    def _is_cached_endpoint(self, endpoint: str) -> bool:
+        """Check whether the ttl policy of the cache covers an endpoint."""
+        ttl_policy = self.cache.ttl_policy
+        return ttl_policy is not None and ttl_policy.lookup("chronicle:" + endpoint) is not None
+
     async def request_game_record(
         self,
         endpoint: str,
@@ -92,7 +107,11 @@ class BaseBattleChronicleClient(base.BaseClient):
             if data["list"]:
                 await self.cache.set(cache_key, data)
             else:
-                raise errors.DataNotPublic({"retcode": 10102})
+                error = errors.DataNotPublic({"retcode": 10102})
+                await self.cache.set_error(cache_key, error.response)
+                raise error
+
+        self._check_cached_error(data)
 
         return [models.hoyolab.RecordCard(**card) for card in data["list"]]
 
@@ -137,6 +156,10 @@ class BaseBattleChronicleClient(base.BaseClient):
             custom_route=routes.CARD_WAPI_URL,
         )
 
+        if self.hoyolab_id is not None:
+            await self.invalidate_cache(family="records", hoyolab_id=self.hoyolab_id)
+        await self._invalidate_account_cache(game)
+
     @deprecation.deprecated("update_settings")
     async def set_visibility(self, public: bool, *, game: typing.Optional[types.Game] = None) -> None:
         """Set your data to public or private."""
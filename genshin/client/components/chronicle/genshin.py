@@ -6,6 +6,8 @@ import typing
 import warnings
 
 from genshin import errors, paginators, types, utility
+from genshin.client import cache as client_cache
+from genshin.client.components import base as base_client
 from genshin.models.genshin import character as character_models
 from genshin.models.genshin import chronicle as models
 
@@ -25,7 +27,8 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         method: str = "GET",
         lang: typing.Optional[str] = None,
         payload: typing.Optional[typing.Mapping[str, typing.Any]] = None,
-        cache: bool = False,
+        cache: typing.Optional[bool] = None,
+        cache_policy: typing.Optional[client_cache.CachePolicy] = None,
     ) -> typing.Mapping[str, typing.Any]:
         """Get an arbitrary genshin object."""
         payload = dict(payload or {})
@@ -40,15 +43,15 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         else:
             params = payload
 
-        cache_key: typing.Optional[base.ChronicleCacheKey] = None
-        if cache:
-            cache_key = base.ChronicleCacheKey(
-                types.Game.GENSHIN,
-                endpoint,
-                uid,
-                lang=lang or self.lang,
-                params=tuple(original_payload.values()),
-            )
+        cache_key = base.ChronicleCacheKey(
+            types.Game.GENSHIN,
+            endpoint,
+            uid,
+            lang=lang or self.lang,
+            params=tuple(original_payload.values()),
+        )
+        # errors like private profiles are cached even when responses are not
+        cached = cache or (cache is None and self._is_cached_endpoint(endpoint))
 
         return await self.request_game_record(
             endpoint,
@@ -57,9 +60,12 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
             region=utility.recognize_region(uid, game=types.Game.GENSHIN),
             params=params,
             data=data,
-            cache=cache_key,
+            cache=cache_key if cached else None,
+            error_cache=cache_key,
+            cache_policy=cache_policy,
         )
 
+    @base_client.cached_model(types.Game.GENSHIN)
     async def get_partial_genshin_user(
         self,
         uid: typing.Optional[int] = None,
@@ -75,6 +81,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         )
         return models.PartialGenshinUserStats(**data)
 
+    @base_client.cached_model(types.Game.GENSHIN)
     async def get_genshin_characters(
         self,
         uid: typing.Optional[int] = None,
@@ -103,6 +110,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         lang: typing.Optional[str] = ...,
         return_raw_data: typing.Literal[True] = ...,
     ) -> typing.Mapping[str, typing.Any]: ...
+    @base_client.cached_model(types.Game.GENSHIN)
     async def get_genshin_detailed_characters(
         self,
         uid: typing.Optional[int] = None,
@@ -158,6 +166,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         lang: typing.Optional[str] = ...,
         raw: typing.Literal[True] = ...,
     ) -> typing.Mapping[str, typing.Any]: ...
+    @base_client.cached_model(types.Game.GENSHIN)
     async def get_genshin_spiral_abyss(
         self,
         uid: typing.Optional[int] = None,
@@ -194,6 +203,7 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
         lang: typing.Optional[str] = ...,
         raw: typing.Literal[True] = ...,
     ) -> typing.Mapping[str, typing.Any]: ...
+    @base_client.cached_model(types.Game.GENSHIN)
     async def get_imaginarium_theater(
         self,
         uid: typing.Optional[int] = None,
@@ -359,6 +369,8 @@ class GenshinBattleChronicleClient(base.BaseBattleChronicleClient):
             ),
         )
 
+        await self.invalidate_cache(uid=uid, game=types.Game.GENSHIN, family="chronicle:index")
+
     async def get_genshin_event_calendar(
         self, uid: typing.Optional[int] = None, *, lang: typing.Optional[str] = None
     ) -> models.GenshinEventCalendar:
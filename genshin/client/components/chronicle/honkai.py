@@ -4,6 +4,7 @@ import asyncio
 import typing
 
 from genshin import errors, types
+from genshin.client import cache as client_cache
 from genshin.models.honkai import chronicle as models
 
 from . import base
@@ -20,19 +21,20 @@ class HonkaiBattleChronicleClient(base.BaseBattleChronicleClient):
         uid: typing.Optional[int] = None,
         *,
         lang: typing.Optional[str] = None,
-        cache: bool = False,
+        cache: typing.Optional[bool] = None,
+        cache_policy: typing.Optional[client_cache.CachePolicy] = None,
     ) -> typing.Mapping[str, typing.Any]:
         """Get an arbitrary honkai object."""
         uid = uid or await self._get_uid(types.Game.HONKAI)
 
-        cache_key: typing.Optional[base.ChronicleCacheKey] = None
-        if cache:
-            cache_key = base.ChronicleCacheKey(
-                types.Game.HONKAI,
-                endpoint,
-                uid,
-                lang=lang or self.lang,
-            )
+        cache_key = base.ChronicleCacheKey(
+            types.Game.HONKAI,
+            endpoint,
+            uid,
+            lang=lang or self.lang,
+        )
+        # errors like private profiles are cached even when responses are not
+        cached = cache or (cache is None and self._is_cached_endpoint(endpoint))
 
         account = await self._get_account(types.Game.HONKAI)
         return await self.request_game_record(
@@ -41,7 +43,9 @@ class HonkaiBattleChronicleClient(base.BaseBattleChronicleClient):
             game=types.Game.HONKAI,
             region=self.region,
             params=dict(server=account.server, role_id=uid),
-            cache=cache_key,
+            cache=cache_key if cached else None,
+            error_cache=cache_key,
+            cache_policy=cache_policy,
         )
 
     async def get_honkai_user(
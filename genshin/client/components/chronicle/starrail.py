@@ -4,6 +4,7 @@ import asyncio
 import typing
 
 from genshin import errors, types, utility
+from genshin.client import cache as client_cache
 from genshin.models.starrail import chronicle as models
 
 from . import base
@@ -22,7 +23,8 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
         method: str = "GET",
         lang: typing.Optional[str] = None,
         payload: typing.Optional[typing.Mapping[str, typing.Any]] = None,
-        cache: bool = False,
+        cache: typing.Optional[bool] = None,
+        cache_policy: typing.Optional[client_cache.CachePolicy] = None,
     ) -> typing.Mapping[str, typing.Any]:
         """Get an arbitrary starrail object."""
         payload = dict(payload or {})
@@ -37,15 +39,15 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
         else:
             params = payload
 
-        cache_key: typing.Optional[base.ChronicleCacheKey] = None
-        if cache:
-            cache_key = base.ChronicleCacheKey(
-                types.Game.STARRAIL,
-                endpoint,
-                uid,
-                lang=lang or self.lang,
-                params=tuple(original_payload.values()),
-            )
+        cache_key = base.ChronicleCacheKey(
+            types.Game.STARRAIL,
+            endpoint,
+            uid,
+            lang=lang or self.lang,
+            params=tuple(original_payload.values()),
+        )
+        # errors like private profiles are cached even when responses are not
+        cached = cache or (cache is None and self._is_cached_endpoint(endpoint))
 
         return await self.request_game_record(
             endpoint,
@@ -54,7 +56,9 @@ class StarRailBattleChronicleClient(base.BaseBattleChronicleClient):
             region=utility.recognize_region(uid, game=types.Game.STARRAIL),
             params=params,
             data=data,
-            cache=cache_key,
+            cache=cache_key if cached else None,
+            error_cache=cache_key,
+            cache_policy=cache_policy,
         )
 
     @typing.overload
@@ -4,6 +4,7 @@ import asyncio
 import typing
 
 from genshin import errors, types, utility
+from genshin.client import cache as client_cache
 from genshin.client import routes
 from genshin.models import zzz as models
 
@@ -23,7 +24,8 @@ class ZZZBattleChronicleClient(base.BaseBattleChronicleClient):
         method: str = "GET",
         lang: typing.Optional[str] = None,
         payload: typing.Optional[typing.Mapping[str, typing.Any]] = None,
-        cache: bool = False,
+        cache: typing.Optional[bool] = None,
+        cache_policy: typing.Optional[client_cache.CachePolicy] = None,
         is_nap_ledger: bool = False,
         is_special_payload: bool = False,
     ) -> typing.Mapping[str, typing.Any]:
@@ -52,15 +54,15 @@ class ZZZBattleChronicleClient(base.BaseBattleChronicleClient):
         else:
             params = payload
 
-        cache_key: typing.Optional[base.ChronicleCacheKey] = None
-        if cache:
-            cache_key = base.ChronicleCacheKey(
-                types.Game.ZZZ,
-                endpoint,
-                uid,
-                lang=lang or self.lang,
-                params=tuple(original_payload.values()),
-            )
+        cache_key = base.ChronicleCacheKey(
+            types.Game.ZZZ,
+            endpoint,
+            uid,
+            lang=lang or self.lang,
+            params=tuple(original_payload.values()),
+        )
+        # errors like private profiles are cached even when responses are not
+        cached = cache or (cache is None and self._is_cached_endpoint(endpoint))
 
         return await self.request_game_record(
             endpoint,
@@ -69,7 +71,9 @@ class ZZZBattleChronicleClient(base.BaseBattleChronicleClient):
             region=utility.recognize_region(uid, game=types.Game.ZZZ),
             params=params,
             data=data,
-            cache=cache_key,
+            cache=cache_key if cached else None,
+            error_cache=cache_key,
+            cache_policy=cache_policy,
             custom_route=routes.NAP_LEDGER_URL if is_nap_ledger else None,
         )
 
@@ -170,7 +170,9 @@ class DailyRewardClient(base.BaseClient):
         challenge: typing.Optional[typing.Mapping[str, str]] = None,
     ) -> typing.Optional[models.DailyReward]:
         """Signs into hoyolab and claims the daily reward."""
-        await self.request_daily_reward("sign", method="POST", game=game, lang=lang, challenge=challenge)
+        await self.request_daily_reward("sign", method="POST", game=game, lang=lang, challenge=challenge, hedge=False)
+        if game := game or self.default_game:
+            await self._invalidate_account_cache(game, family="diary")
 
         if not reward:
             return None
@@ -143,6 +143,7 @@ class DiaryClient(base.BaseClient):
         """Get a traveler's diary with earning details for the month."""
         return await self.get_genshin_diary(uid, month=month, lang=lang)
 
+    @base.cached_model(types.Game.GENSHIN)
     async def get_genshin_diary(
         self,
         uid: typing.Optional[int] = None,
@@ -159,6 +160,7 @@ class DiaryClient(base.BaseClient):
         data = await self.request_ledger(uid, game=game, month=month, lang=lang, cache=cache_key)
         return models.Diary(**data)
 
+    @base.cached_model(types.Game.STARRAIL)
     async def get_starrail_diary(
         self,
         uid: typing.Optional[int] = None,
@@ -126,6 +126,7 @@ class HoyolabClient(base.BaseClient):
         method: typing.Optional[str] = None,
         params: typing.Optional[typing.Mapping[str, typing.Any]] = None,
         data: typing.Any = None,
+        hedge: typing.Optional[bool] = None,
     ) -> typing.Any:
         game_id = params.get("game_id") if params else data.get("game_id")
         if game_id is None and self.game is None:
@@ -135,7 +136,7 @@ class HoyolabClient(base.BaseClient):
             url = routes.MIMO_URL.get_url() / "nata" / endpoint.replace("-", "_")
         else:
             url = routes.MIMO_URL.get_url() / endpoint
-        return await self.request(url, method=method, params=params, data=data)
+        return await self.request(url, method=method, params=params, data=data, hedge=hedge)
 
     async def search_users(
         self,
@@ -256,7 +257,10 @@ class HoyolabClient(base.BaseClient):
                 lang=utility.create_short_lang_code(lang or self.lang),
             ),
             method="POST" if game is types.Game.STARRAIL else "GET",
+            # redeeming isn't idempotent despite using GET
+            hedge=False,
         )
+        await self.invalidate_cache(uid=uid, game=game, family="diary")
 
     @managers.no_multi
     async def check_in_community(self) -> None:
@@ -346,6 +350,8 @@ class HoyolabClient(base.BaseClient):
             "receive-point",
             params=dict(task_id=task_id, game_id=game_id, lang=lang or self.lang, version_id=version_id),
             method="POST" if game_id == 2 else "GET",
+            # claiming isn't idempotent despite using GET
+            hedge=False,
         )
 
     @base.region_specific(types.Region.OVERSEAS)
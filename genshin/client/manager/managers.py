@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import abc
+import collections
+import contextlib
+import dataclasses
 import functools
 import http.cookies
 import logging
@@ -15,12 +18,15 @@ import yarl
 
 from genshin import errors, types
 from genshin.client import ratelimit
+from genshin.client import scheduler as client_scheduler
+from genshin.utility import codec as codec_utility
 from genshin.utility import fs as fs_utility
 
 _LOGGER = logging.getLogger(__name__)
 
 __all__ = [
     "BaseCookieManager",
+    "ConnectionConfig",
     "CookieManager",
     "InternationalCookieManager",
     "RotatingCookieManager",
@@ -61,12 +67,101 @@ def get_cookie_identifier(cookie: typing.Mapping[str, str]) -> typing.Optional[s
     return None
 
 
+@dataclasses.dataclass(frozen=True)
+class ConnectionConfig:
+    """Configuration of the connection pool used by sessions.
+
+    Defaults are sized for many concurrent requests towards the handful of hoyolab hosts.
+    """
+
+    limit: int = 256
+    """Total number of simultaneous connections, 0 for no limit."""
+    limit_per_host: int = 64
+    """Number of simultaneous connections to a single host, 0 for no limit."""
+    keepalive_timeout: float = 30
+    """Seconds an idle connection is kept open for reuse."""
+    use_dns_cache: bool = True
+    """Whether to cache resolved hostnames."""
+    ttl_dns_cache: typing.Optional[int] = 300
+    """Seconds resolved hostnames are cached for, None to cache forever."""
+
+    def connector_kwargs(self) -> dict[str, typing.Any]:
+        """Get the keyword arguments for a connector."""
+        return dict(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.use_dns_cache,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+
+class _SessionUsage:
+    """Number of requests using each pooled session.
+
+    Retired sessions are closed once the last request using them finishes.
+    """
+
+    users: collections.Counter[aiohttp.ClientSession]
+    retired: set[aiohttp.ClientSession]
+
+    def __init__(self) -> None:
+        self.users = collections.Counter()
+        self.retired = set()
+
+    def acquire(self, session: aiohttp.ClientSession) -> None:
+        """Start using a session."""
+        self.users[session] += 1
+
+    async def release(self, session: aiohttp.ClientSession) -> None:
+        """Stop using a session, closing it if it's retired and no longer used."""
+        self.users[session] -= 1
+        if self.users[session] > 0:
+            return
+
+        del self.users[session]
+        if session in self.retired:
+            self.retired.discard(session)
+            await session.close()
+
+    async def retire(self, session: aiohttp.ClientSession) -> None:
+        """Close a session once no request uses it anymore."""
+        if self.users[session] > 0:
+            self.retired.add(session)
+        else:
+            await session.close()
+
+    async def close(self) -> None:
+        """Close all retired sessions."""
+        sessions, self.retired = self.retired, set()
+        for session in sessions:
+            await session.close()
+
+
 class BaseCookieManager(abc.ABC):
     """A cookie manager for making requests."""
 
     _proxy: typing.Optional[yarl.URL] = None
     _socks_proxy: typing.Optional[str] = None
 
+    keep_alive: bool = False
+    """Whether to reuse a single pooled session across requests. Requires the manager to be closed."""
+    _session: typing.Optional[aiohttp.ClientSession] = None
+    _session_socks_proxy: typing.Optional[str] = None
+    _session_usage: typing.Optional[_SessionUsage] = None
+    connection_config: ConnectionConfig = ConnectionConfig()
+    _json_codec: typing.Optional[codec_utility.JSONCodec] = None
+    rate_limiter: typing.Optional[ratelimit.RateLimiter] = None
+    """Ratelimiter delaying requests before they are sent, shared by every cookie."""
+    concurrency_limiter: typing.Optional[ratelimit.AdaptiveConcurrencyLimiter] = None
+    """Limiter of concurrent requests adapting to ratelimits, shared by every cookie."""
+    circuit_breaker: typing.Optional[ratelimit.CircuitBreaker] = None
+    """Circuit breaker failing fast towards hosts which keep failing."""
+    retry_budget: typing.Optional[ratelimit.RetryBudget] = None
+    """Budget limiting retries to a fraction of all requests."""
+    scheduler: typing.Optional[client_scheduler.RequestScheduler] = None
+    """Scheduler letting interactive requests through before background ones, holding a slot per attempt."""
+
     @classmethod
     def from_cookies(cls, cookies: typing.Optional[AnyCookieOrHeader] = None) -> BaseCookieManager:
         """Create an arbitrary cookie manager implementation instance."""
@@ -127,20 +222,74 @@ class BaseCookieManager(abc.ABC):
 
         self._proxy = proxy
 
-    def create_session(self, **kwargs: typing.Any) -> aiohttp.ClientSession:
+    @property
+    def json_codec(self) -> codec_utility.JSONCodec:
+        """Codec used to encode and decode json, the default codec if unset."""
+        return self._json_codec or codec_utility.get_default_json_codec()
+
+    @json_codec.setter
+    def json_codec(self, codec: typing.Optional[codec_utility.JSONCodec]) -> None:
+        self._json_codec = codec
+
+    def create_session(
+        self, connection_config: typing.Optional[ConnectionConfig] = None, **kwargs: typing.Any
+    ) -> aiohttp.ClientSession:
         """Create a client session."""
+        connector_kwargs = (connection_config or self.connection_config).connector_kwargs()
+
+        connector: aiohttp.BaseConnector
         if self._socks_proxy is not None:
             import aiohttp_socks
 
-            connector = aiohttp_socks.ProxyConnector.from_url(self._socks_proxy)
+            connector = aiohttp_socks.ProxyConnector.from_url(self._socks_proxy, **connector_kwargs)
         else:
-            connector = None
+            connector = aiohttp.TCPConnector(**connector_kwargs)
 
-        return aiohttp.ClientSession(
-            cookie_jar=aiohttp.DummyCookieJar(),
-            connector=connector,
-            **kwargs,
-        )
+        # request bodies keep aiohttp's default json.dumps, dynamic secrets sign the exact same string
+        return aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar(), connector=connector, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def acquire_session(self) -> typing.AsyncIterator[aiohttp.ClientSession]:
+        """Acquire a client session for the duration of a request.
+
+        With `keep_alive` the pooled session is lazily created and reused, otherwise a new session is made.
+        """
+        if not self.keep_alive:
+            async with self.create_session() as session:
+                yield session
+
+            return
+
+        if self._session_usage is None:
+            self._session_usage = _SessionUsage()
+
+        # the session may be handed over to another manager while it's used
+        usage = self._session_usage
+        if self._session is not None and self._session_socks_proxy != self._socks_proxy:
+            # the connector of a session can't switch to another socks proxy
+            # requests still using the old session are left to finish before it's closed
+            session, self._session = self._session, None
+            await usage.retire(session)
+
+        if self._session is None or self._session.closed:
+            self._session = self.create_session()
+            self._session_socks_proxy = self._socks_proxy
+
+        session = self._session
+        usage.acquire(session)
+        try:
+            yield session
+        finally:
+            await usage.release(session)
+
+    async def close(self) -> None:
+        """Close the pooled session if there is one."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+        if self._session_usage is not None:
+            await self._session_usage.close()
 
     @ratelimit.handle_ratelimits()
     @ratelimit.handle_request_timeouts()
@@ -152,13 +301,76 @@ class BaseCookieManager(abc.ABC):
         **kwargs: typing.Any,
     ) -> typing.Any:
         """Make a request towards any json resource."""
-        async with self.create_session() as session:
-            async with session.request(method, str_or_url, proxy=self.proxy, cookies=cookies, **kwargs) as response:
+        priority: typing.Optional[client_scheduler.Priority] = kwargs.pop("priority", None)
+
+        circuit: typing.ContextManager[typing.Any] = contextlib.nullcontext()
+        if self.circuit_breaker is not None:
+            circuit = self.circuit_breaker.guard(str_or_url)
+
+        with circuit:
+            cookie_identifier = get_cookie_identifier(cookies)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(str_or_url, cookie_identifier)
+
+            if self.retry_budget is not None:
+                self.retry_budget.record_request()
+
+            async with self._limit_concurrency(str_or_url, cookie_identifier):
+                # the slot is only held while sending this attempt, not while throttled or waiting to retry
+                async with self._schedule(priority):
+                    return await self._send_request(method, str_or_url, cookies, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def _limit_concurrency(
+        self, str_or_url: aiohttp.typedefs.StrOrURL, cookie_identifier: typing.Optional[str] = None
+    ) -> typing.AsyncIterator[None]:
+        """Wait for the concurrency limiter to let a request through."""
+        if self.concurrency_limiter is None:
+            yield
+            return
+
+        async with self.concurrency_limiter.limit(str_or_url, cookie_identifier):
+            yield
+
+    @contextlib.asynccontextmanager
+    async def _schedule(
+        self, priority: typing.Optional[client_scheduler.Priority] = None
+    ) -> typing.AsyncIterator[None]:
+        """Wait for the scheduler to let a request through."""
+        if self.scheduler is None:
+            yield
+            return
+
+        async with self.scheduler.slot(priority):
+            yield
+
+    async def _send_request(
+        self,
+        method: str,
+        str_or_url: aiohttp.typedefs.StrOrURL,
+        cookies: typing.MutableMapping[str, str],
+        *,
+        return_body: bool = False,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Send a single request towards any json resource without retrying.
+
+        With `return_body` the raw body of the response is returned beside the data so caches may save it as is.
+        """
+        proxy = kwargs.pop("proxy", self.proxy)
+        async with self.acquire_session() as session:
+            async with session.request(method, str_or_url, proxy=proxy, cookies=cookies, **kwargs) as response:
                 if response.content_type != "application/json":
                     content = await response.text()
+                    # error pages of a degraded host, unlike json errors they count as failures of the host
+                    if response.status >= 500:
+                        msg = f"Recieved an error page with status {response.status}:\n" + content
+                        raise errors.ServerError(msg=msg)
+
                     raise errors.GenshinException(msg="Recieved a response with an invalid content type:\n" + content)
 
-                data = await response.json()
+                body = await response.read()
+                data = self.json_codec.loads(body)
 
                 if not self.multi:
                     new_cookies = parse_cookie(response.cookies)
@@ -172,8 +384,9 @@ class BaseCookieManager(abc.ABC):
         retcode = data.get("retcode")
         if retcode is None or retcode == 0:
             if "data" in data:
-                return data["data"]
-            return data
+                data = data["data"]
+
+            return (data, body) if return_body else data
 
         errors.raise_for_retcode(data)
 
@@ -1,18 +1,59 @@
 """Ratelimit handlers."""
 
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
 import logging
+import time
 import typing
 
 import aiohttp
-from tenacity import before_sleep_log, retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+import aiohttp.typedefs
+import yarl
+from tenacity import (
+    RetryCallState,
+    before_sleep_log,
+    retry,
+    retry_base,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
 from genshin import errors
+from genshin.utility import concurrency
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "Circuit",
+    "CircuitBreaker",
+    "ConcurrencyLimit",
+    "RateLimit",
+    "RateLimiter",
+    "RetryBudget",
+    "TokenBucket",
+]
 
 LOGGER_ = logging.getLogger(__name__)
 TIMEOUT_ERRORS = (TimeoutError, aiohttp.ClientError, ConnectionResetError)
 CallableT = typing.TypeVar("CallableT", bound=typing.Callable[..., typing.Awaitable[typing.Any]])
 
 
+class retry_if_budget_allows(retry_base):
+    """Retry only while the retry budget of the cookie manager making the request allows it."""
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        budget: typing.Optional[RetryBudget] = getattr(next(iter(retry_state.args), None), "retry_budget", None)
+        if budget is None or budget.withdraw():
+            return True
+
+        LOGGER_.debug("Not retrying %s, the retry budget is exhausted", retry_state.fn)
+        return False
+
+
 def handle_ratelimits(
     tries: int = 10,
     exception: type[errors.GenshinException] = errors.VisitsTooFrequently,
@@ -22,7 +63,7 @@ def handle_ratelimits(
     return retry(
         stop=stop_after_attempt(tries),
         wait=wait_random_exponential(multiplier=delay, min=delay),
-        retry=retry_if_exception_type(exception),
+        retry=retry_if_exception_type(exception) & retry_if_budget_allows(),
         reraise=True,
         before_sleep=before_sleep_log(LOGGER_, logging.DEBUG),
     )
@@ -39,7 +80,7 @@ def handle_request_timeouts(
         return retry(
             stop=stop_after_attempt(tries),
             wait=wait_random_exponential(multiplier=delay, min=delay),
-            retry=retry_if_exception_type(TIMEOUT_ERRORS),
+            retry=retry_if_exception_type(TIMEOUT_ERRORS) & retry_if_budget_allows(),
             reraise=True,
             before_sleep=before_sleep_log(LOGGER_, logging.DEBUG),
         )
@@ -47,7 +88,487 @@ def handle_request_timeouts(
         return retry(
             stop=stop_after_attempt(tries),
             wait=wait_random_exponential(multiplier=delay, min=delay),
-            retry=retry_if_exception_type((ProxyError, *TIMEOUT_ERRORS)),
+            retry=retry_if_exception_type((ProxyError, *TIMEOUT_ERRORS)) & retry_if_budget_allows(),
             reraise=True,
             before_sleep=before_sleep_log(LOGGER_, logging.DEBUG),
         )
+
+
+def get_endpoint_family(url: aiohttp.typedefs.StrOrURL) -> str:
+    """Get the family of an endpoint which shares ratelimits: chronicle, gacha, daily or hoyolab."""
+    path = yarl.URL(url).path
+    if "game_record" in path:
+        return "chronicle"
+    if "gacha" in path:
+        return "gacha"
+    if path.startswith(("/event/sol", "/event/mani", "/event/luna")):
+        return "daily"
+
+    return "hoyolab"
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimit:
+    """Rate of requests allowed by a token bucket."""
+
+    rate: float
+    """Requests per second on average."""
+    burst: float = 1
+    """Requests which can be made at once after being idle."""
+
+
+class TokenBucket:
+    """Token bucket refilled with `rate` tokens per second up to `burst` tokens.
+
+    Tokens are reserved in advance so waiting callers are served in order without a lock.
+    """
+
+    limit: RateLimit
+    tokens: float
+    updated: float
+
+    def __init__(self, limit: RateLimit) -> None:
+        self.limit = limit
+        self.tokens = limit.burst
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+        self.updated = now
+
+    @property
+    def full(self) -> bool:
+        """Whether the bucket has been idle for long enough to be forgotten."""
+        self._refill()
+        return self.tokens >= self.limit.burst
+
+    def reserve(self) -> float:
+        """Take a token and get the seconds to wait before it may be used."""
+        self._refill()
+        self.tokens -= 1
+        return max(0, -self.tokens / self.limit.rate)
+
+    async def acquire(self) -> None:
+        """Wait for a token."""
+        if delay := self.reserve():
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """Proactive ratelimiter which delays requests to stay under the upstream ratelimits.
+
+    Every host, cookie and endpoint family has its own token bucket with the limit of its family.
+    """
+
+    limits: dict[str, RateLimit]
+    default: typing.Optional[RateLimit]
+    maxsize: int
+    waits: int
+    """Number of requests which had to wait."""
+
+    _buckets: dict[tuple[str, typing.Optional[str], str], TokenBucket]
+
+    def __init__(
+        self,
+        limits: typing.Optional[typing.Mapping[str, RateLimit]] = None,
+        *,
+        default: typing.Optional[RateLimit] = None,
+        maxsize: int = 1024,
+    ) -> None:
+        self.limits = dict(limits or {})
+        self.default = default
+        self.maxsize = maxsize
+        self.waits = 0
+        self._buckets = {}
+
+    @classmethod
+    def recommended(cls) -> RateLimiter:
+        """Create a ratelimiter staying under the observed ratelimits of each endpoint family."""
+        return cls(
+            {
+                "chronicle": RateLimit(1, burst=10),
+                "gacha": RateLimit(2, burst=5),
+                "daily": RateLimit(1, burst=3),
+                "hoyolab": RateLimit(5, burst=10),
+            }
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.limits!r}, default={self.default!r})"
+
+    def get_bucket(
+        self, url: aiohttp.typedefs.StrOrURL, cookie: typing.Optional[str] = None
+    ) -> typing.Optional[TokenBucket]:
+        """Get the bucket of a request, None if its family is not limited."""
+        url = yarl.URL(url)
+        family = get_endpoint_family(url)
+        limit = self.limits.get(family, self.default)
+        if limit is None:
+            return None
+
+        key = (url.host or "", cookie, family)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.maxsize:
+                self._prune()
+
+            bucket = self._buckets[key] = TokenBucket(limit)
+
+        return bucket
+
+    def _prune(self) -> None:
+        """Forget buckets which are full and therefore equivalent to new ones."""
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if not bucket.full}
+
+    async def acquire(self, url: aiohttp.typedefs.StrOrURL, cookie: typing.Optional[str] = None) -> None:
+        """Wait until a request may be sent."""
+        bucket = self.get_bucket(url, cookie)
+        if bucket is None:
+            return
+
+        if delay := bucket.reserve():
+            self.waits += 1
+            LOGGER_.debug("Delaying request to %s by %.2fs to avoid ratelimits", url, delay)
+            await asyncio.sleep(delay)
+
+
+class ConcurrencyLimit(concurrency.SlotPool):
+    """Adaptive limit of concurrent requests and statistics of the decisions taken."""
+
+    limit: float
+    """Current number of requests allowed to be in flight."""
+    inflight: int
+    """Number of requests in flight."""
+    successes: int
+    """Number of requests which were not overloaded."""
+    overloads: int
+    """Number of requests which were ratelimited or timed out."""
+    increases: int
+    """Number of times the limit was raised."""
+    decreases: int
+    """Number of times the limit was cut."""
+    waits: int
+    """Number of requests which had to wait for another one to finish."""
+
+    _epoch: int
+    _waiters: collections.deque[asyncio.Future[None]]
+
+    def __init__(self, limit: float) -> None:
+        super().__init__()
+        self.limit = limit
+        self.successes = 0
+        self.overloads = 0
+        self.increases = 0
+        self.decreases = 0
+        self.waits = 0
+        self._epoch = 0
+        self._waiters = collections.deque()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} limit={self.limit:.1f} inflight={self.inflight}>"
+
+    async def acquire(self) -> int:
+        """Wait for a free slot and get the epoch of the limit the request was started with."""
+        await self._take()
+        return self._epoch
+
+    def raise_limit(self, step: float, maximum: float) -> None:
+        """Raise the limit after a successful request if it is being used."""
+        self.successes += 1
+        if self.inflight * 2 >= self.limit and self.limit < maximum:
+            self.limit = min(maximum, self.limit + step / self.limit)
+            self.increases += 1
+
+    def cut_limit(self, epoch: int, factor: float, minimum: float) -> bool:
+        """Cut the limit after an overloaded request unless it was already cut since the request started."""
+        self.overloads += 1
+        if epoch != self._epoch:
+            return False
+
+        self._epoch += 1
+        self.limit = max(minimum, self.limit * factor)
+        self.decreases += 1
+        return True
+
+    def _available(self, ticket: typing.Any) -> bool:
+        return self.inflight < self.limit and not self._waiters
+
+    def _enqueue(self, ticket: typing.Any, future: asyncio.Future[None]) -> None:
+        self.waits += 1
+        self._waiters.append(future)
+
+    def _next_waiter(self) -> typing.Optional[asyncio.Future[None]]:
+        if self._waiters and self.inflight < self.limit:
+            return self._waiters.popleft()
+
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limiter of concurrent requests which finds the highest sustainable concurrency by itself.
+
+    The limit is raised by `increase` for every limit worth of successful requests made while at least half of the
+    limit is in use and multiplied by `backoff` when a request is ratelimited or times out (AIMD).
+    Requests are limited per host or per cookie.
+    """
+
+    initial: float
+    minimum: float
+    maximum: float
+    increase: float
+    backoff: float
+    per: typing.Literal["host", "cookie"]
+    overload_errors: tuple[type[BaseException], ...]
+
+    limits: dict[typing.Optional[str], ConcurrencyLimit]
+
+    def __init__(
+        self,
+        initial: float = 8,
+        *,
+        minimum: float = 1,
+        maximum: float = 128,
+        increase: float = 1,
+        backoff: float = 0.5,
+        per: typing.Literal["host", "cookie"] = "host",
+    ) -> None:
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.backoff = backoff
+        self.per = per
+        self.overload_errors = (errors.VisitsTooFrequently, errors.TooManyRequests, *TIMEOUT_ERRORS)
+        self.limits = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} per={self.per} limits={self.limits!r}>"
+
+    def get_limit(self, url: aiohttp.typedefs.StrOrURL, cookie: typing.Optional[str] = None) -> ConcurrencyLimit:
+        """Get the limit of a request."""
+        key = cookie if self.per == "cookie" else yarl.URL(url).host
+        if (limit := self.limits.get(key)) is None:
+            limit = self.limits[key] = ConcurrencyLimit(self.initial)
+
+        return limit
+
+    @contextlib.asynccontextmanager
+    async def limit(
+        self, url: aiohttp.typedefs.StrOrURL, cookie: typing.Optional[str] = None
+    ) -> typing.AsyncIterator[ConcurrencyLimit]:
+        """Hold a slot for the duration of a request and adapt the limit to its outcome."""
+        limit = self.get_limit(url, cookie)
+        epoch = await limit.acquire()
+        try:
+            yield limit
+        except self.overload_errors:
+            # requests started before the last cut were part of the same overload
+            if limit.cut_limit(epoch, self.backoff, self.minimum):
+                LOGGER_.debug("Cutting concurrency limit of %s to %.1f", url, limit.limit)
+            raise
+        else:
+            limit.raise_limit(self.increase, self.maximum)
+        finally:
+            limit.release()
+
+
+class RetryBudget:
+    """Budget limiting retries to a fraction of the requests sent in the last `window` seconds.
+
+    A budget should be shared by every client so retries can't multiply the load on degraded hosts.
+    """
+
+    ratio: float
+    minimum: int
+    window: float
+    rejected: int
+    """Number of retries which were not allowed."""
+
+    _requests: collections.deque[float]
+    _retries: collections.deque[float]
+
+    def __init__(self, ratio: float = 0.2, *, minimum: int = 10, window: float = 10) -> None:
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self.rejected = 0
+        self._requests = collections.deque()
+        self._retries = collections.deque()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} requests={len(self._requests)} retries={len(self._retries)}>"
+
+    def _prune(self) -> float:
+        now = time.monotonic()
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < now - self.window:
+                timestamps.popleft()
+
+        return now
+
+    def record_request(self) -> None:
+        """Record a request being sent, including retries."""
+        self._requests.append(self._prune())
+
+    def withdraw(self) -> bool:
+        """Take a retry from the budget if there is any left."""
+        now = self._prune()
+        if len(self._retries) >= self.minimum + self.ratio * len(self._requests):
+            self.rejected += 1
+            return False
+
+        self._retries.append(now)
+        return True
+
+
+class Circuit:
+    """State and recent outcomes of requests towards a single host."""
+
+    state: typing.Literal["closed", "open", "half-open"]
+    opened: float
+    """Time the circuit was last opened at."""
+    probes: int
+    """Number of probing requests in flight while half-open."""
+    trips: int
+    """Number of times the circuit was opened."""
+
+    _outcomes: collections.deque[tuple[float, bool]]
+
+    def __init__(self) -> None:
+        self.state = "closed"
+        self.opened = 0
+        self.probes = 0
+        self.trips = 0
+        self._outcomes = collections.deque()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} state={self.state} trips={self.trips}>"
+
+    def open(self) -> None:
+        """Stop sending requests."""
+        self.state = "open"
+        self.opened = time.monotonic()
+        self.probes = 0
+        self.trips += 1
+        self._outcomes.clear()
+
+    def close(self) -> None:
+        """Send requests normally."""
+        self.state = "closed"
+        self.probes = 0
+
+    def add_outcome(self, failed: bool, window: float) -> tuple[int, int]:
+        """Add the outcome of a request and get the number of failed and total requests in the window."""
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        while self._outcomes[0][0] < now - window:
+            self._outcomes.popleft()
+
+        return sum(failed for _, failed in self._outcomes), len(self._outcomes)
+
+
+class CircuitBreaker:
+    """Circuit breaker which fails fast when requests towards a host keep failing.
+
+    A circuit opens once at least `threshold` of at least `minimum` requests sent in the last `window` seconds failed.
+    After `recovery_time` seconds it lets `probes` requests through and closes again if they succeed.
+    """
+
+    threshold: float
+    minimum: int
+    window: float
+    recovery_time: float
+    max_probes: int
+    failure_errors: tuple[type[BaseException], ...]
+
+    circuits: dict[str, Circuit]
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        *,
+        minimum: int = 20,
+        window: float = 30,
+        recovery_time: float = 30,
+        probes: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self.minimum = minimum
+        self.window = window
+        self.recovery_time = recovery_time
+        self.max_probes = probes
+        # degraded hosts answer with html error pages instead of timing out
+        self.failure_errors = (*TIMEOUT_ERRORS, errors.ServerError)
+        self.circuits = {}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} circuits={self.circuits!r}>"
+
+    def get_circuit(self, host: str) -> Circuit:
+        """Get the circuit of a host."""
+        if (circuit := self.circuits.get(host)) is None:
+            circuit = self.circuits[host] = Circuit()
+
+        return circuit
+
+    def allow(self, host: str) -> bool:
+        """Check whether a request may be sent to a host, half-open circuits only let probes through."""
+        circuit = self.get_circuit(host)
+        if circuit.state == "open":
+            if time.monotonic() - circuit.opened < self.recovery_time:
+                return False
+
+            circuit.state = "half-open"
+
+        if circuit.state == "half-open":
+            if circuit.probes >= self.max_probes:
+                return False
+
+            circuit.probes += 1
+
+        return True
+
+    def record(self, host: str, failed: bool) -> None:
+        """Record the outcome of a request."""
+        circuit = self.get_circuit(host)
+        if circuit.state == "half-open":
+            if failed:
+                circuit.open()
+                LOGGER_.warning("Circuit of %s opened again, it is still failing", host)
+            else:
+                circuit.close()
+            return
+
+        if circuit.state == "open":
+            return
+
+        failures, total = circuit.add_outcome(failed, self.window)
+        if total >= self.minimum and failures >= self.threshold * total:
+            circuit.open()
+            LOGGER_.warning("Circuit of %s opened, %d of %d requests failed", host, failures, total)
+
+    @contextlib.contextmanager
+    def guard(self, url: aiohttp.typedefs.StrOrURL) -> typing.Iterator[Circuit]:
+        """Fail fast if the circuit of a host is open and record the outcome of the request."""
+        host = yarl.URL(url).host or ""
+        if not self.allow(host):
+            raise errors.CircuitOpen(msg=f"Requests towards {host} are failing, retry in {self.recovery_time}s.")
+
+        circuit = self.get_circuit(host)
+        try:
+            yield circuit
+        except self.failure_errors:
+            self.record(host, True)
+            raise
+        except Exception:
+            # the host answered with an error
+            self.record(host, False)
+            raise
+        except BaseException:
+            # cancelled requests don't tell anything about the host
+            if circuit.state == "half-open":
+                circuit.probes -= 1
+            raise
+        else:
+            self.record(host, False)
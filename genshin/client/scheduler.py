@@ -0,0 +1,129 @@
+"""Priority-aware request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import enum
+import typing
+
+from genshin.utility import concurrency
+
+__all__ = ["Priority", "RequestScheduler", "get_priority", "use_priority"]
+
+
+class Priority(enum.IntEnum):
+    """Priority class of a request."""
+
+    INTERACTIVE = 0
+    """Requests someone is waiting for, sent before any other request."""
+
+    BACKGROUND = 1
+    """Requests of background jobs, sent with leftover capacity."""
+
+
+_priority: contextvars.ContextVar[typing.Optional[tuple[Priority, typing.Hashable]]] = contextvars.ContextVar(
+    "genshin_priority", default=None
+)
+
+
+def get_priority() -> typing.Optional[tuple[Priority, typing.Hashable]]:
+    """Get the priority and flow set with `use_priority` in the current context."""
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def use_priority(priority: Priority, *, flow: typing.Hashable = None) -> typing.Iterator[None]:
+    """Use a priority for all requests made in a block, including ones of concurrent tasks it starts.
+
+    Requests of the same priority are queued fairly between flows, by default every task is its own flow.
+    """
+    token = _priority.set((Priority(priority), flow))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RequestScheduler(concurrency.SlotPool):
+    """Scheduler letting at most `limit` requests through at once, in order of priority.
+
+    Waiting requests of the same priority take turns between their flows.
+    `reserved` slots are kept for interactive requests so they never wait for background jobs to finish.
+    """
+
+    limit: int
+    reserved: int
+    inflight: int
+    """Number of requests let through and not finished yet."""
+    waits: dict[Priority, int]
+    """Number of requests which had to wait by priority."""
+
+    _queues: dict[Priority, collections.OrderedDict[typing.Hashable, collections.deque[asyncio.Future[None]]]]
+
+    def __init__(self, limit: int = 16, *, reserved: int = 2) -> None:
+        if not 0 <= reserved < limit:
+            raise ValueError("At least one slot must be left for background requests.")
+
+        super().__init__()
+        self.limit = limit
+        self.reserved = reserved
+        self.waits = dict.fromkeys(Priority, 0)
+        self._queues = {priority: collections.OrderedDict() for priority in Priority}
+
+    def __repr__(self) -> str:
+        queued = {priority.name: sum(map(len, queue.values())) for priority, queue in self._queues.items()}
+        return f"<{type(self).__name__} inflight={self.inflight} queued={queued}>"
+
+    def _capacity(self, priority: Priority) -> int:
+        """Get the number of requests of a priority which may be in flight."""
+        return self.limit if priority == Priority.INTERACTIVE else self.limit - self.reserved
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE, flow: typing.Hashable = None) -> None:
+        """Wait for a slot."""
+        await self._take((priority, flow))
+
+    def _available(self, ticket: tuple[Priority, typing.Hashable]) -> bool:
+        return self.inflight < self._capacity(ticket[0]) and not any(self._queues.values())
+
+    def _enqueue(self, ticket: tuple[Priority, typing.Hashable], future: asyncio.Future[None]) -> None:
+        priority, flow = ticket
+        self.waits[priority] += 1
+        self._queues[priority].setdefault(flow, collections.deque()).append(future)
+
+    def _next_waiter(self) -> typing.Optional[asyncio.Future[None]]:
+        """Dequeue the next waiting request by priority and then flow by flow."""
+        for priority, queue in self._queues.items():
+            if queue and self.inflight < self._capacity(priority):
+                flow, waiters = next(iter(queue.items()))
+                future = waiters.popleft()
+                if waiters:
+                    queue.move_to_end(flow)
+                else:
+                    del queue[flow]
+
+                return future
+
+        return None
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, priority: typing.Optional[Priority] = None, flow: typing.Hashable = None
+    ) -> typing.AsyncIterator[None]:
+        """Hold a slot for the duration of a request.
+
+        The priority and flow default to the ones set with `use_priority`, or interactive requests of the current task.
+        """
+        context = get_priority()
+        if priority is None:
+            priority = context[0] if context else Priority.INTERACTIVE
+        if flow is None:
+            flow = context[1] if context and context[1] is not None else asyncio.current_task()
+
+        await self.acquire(priority, flow)
+        try:
+            yield
+        finally:
+            self.release()
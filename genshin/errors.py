@@ -11,6 +11,8 @@ __all__ = [
     "AlreadyClaimed",
     "AuthkeyException",
     "AuthkeyTimeout",
+    "CacheMiss",
+    "CircuitOpen",
     "CookieException",
     "DailyGeetestTriggered",
     "DataNotPublic",
@@ -22,6 +24,7 @@ __all__ = [
     "RedemptionCooldown",
     "RedemptionException",
     "RedemptionInvalid",
+    "ServerError",
     "TooManyRequests",
     "check_for_geetest",
     "raise_for_retcode",
@@ -256,6 +259,24 @@ class NoNeedGeetest(GenshinException):
     """No need to do geetest."""
 
 
+class CacheMiss(GenshinException):
+    """Requested data is not cached and the cache policy forbids requesting it."""
+
+    msg = "Requested data is not cached."
+
+
+class ServerError(GenshinException):
+    """The server answered with an error page instead of json, it is most likely overloaded or down."""
+
+    msg = "Server failed to answer the request."
+
+
+class CircuitOpen(GenshinException):
+    """Too many recent requests towards a host failed, it's not requested until it recovers."""
+
+    msg = "Host is unavailable, too many requests failed."
+
+
 _TGE = type[GenshinException]
 _errors: dict[int, typing.Union[_TGE, str, tuple[_TGE, typing.Optional[str]]]] = {
     # misc hoyolab
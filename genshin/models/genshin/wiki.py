@@ -1,13 +1,13 @@
 """Genshin wish models."""
 
 import enum
-import json
 import typing
 import unicodedata
 
 import pydantic
 
 from genshin.models.model import Aliased, APIModel, Unique
+from genshin.utility import codec
 
 __all__ = [
     "ArtifactPreview",
@@ -121,7 +121,7 @@ class EnemyPreview(BaseWikiPreview):
 
     @pydantic.field_validator("drop_materials", mode="before")
     def __parse_drop_materials(cls, value: typing.Union[str, typing.Sequence[str]]) -> typing.Sequence[str]:
-        return json.loads(value) if isinstance(value, str) else value
+        return codec.get_default_json_codec().loads(value) if isinstance(value, str) else value
 
 
 _ENTRY_PAGE_MODELS: typing.Mapping[WikiPageType, type[BaseWikiPreview]] = {
@@ -152,10 +152,12 @@ class WikiPage(APIModel):
         if isinstance(value, typing.Mapping):
             return value
 
+        json_codec = codec.get_default_json_codec()
         modules: dict[str, dict[str, typing.Any]] = {}
         for module in value:
             components: dict[str, dict[str, typing.Any]] = {
-                component["component_id"]: json.loads(component["data"] or "{}") for component in module["components"]
+                component["component_id"]: json_codec.loads(component["data"] or "{}")
+                for component in module["components"]
             }
 
             components.pop("map", None)  # not worth storing
@@ -1,7 +1,9 @@
 """Utilities for genshin.py."""
 
 from .auth import *
+from .codec import *
 from .concurrency import *
+from .conditional import *
 from .ds import *
 from .extdb import *
 from .fs import *
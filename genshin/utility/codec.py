@@ -0,0 +1,136 @@
+"""Pluggable json codecs."""
+
+from __future__ import annotations
+
+import abc
+import json
+import typing
+
+__all__ = [
+    "JSONCodec",
+    "MsgspecCodec",
+    "OrjsonCodec",
+    "StdlibCodec",
+    "get_default_json_codec",
+    "get_json_codec",
+    "set_default_json_codec",
+]
+
+
+def _default(obj: typing.Any) -> typing.Any:
+    """Convert objects unsupported by fast json libraries."""
+    if isinstance(obj, tuple):
+        return list(obj)  # pyright: ignore[reportUnknownArgumentType]
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec(abc.ABC):
+    """Encoder and decoder of json data."""
+
+    name: typing.ClassVar[str]
+
+    @abc.abstractmethod
+    def dumps(self, obj: typing.Any) -> bytes:
+        """Encode an object into compact utf-8 json."""
+
+    @abc.abstractmethod
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        """Decode json into an object."""
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}>"
+
+
+class StdlibCodec(JSONCodec):
+    """Codec using the standard library json module."""
+
+    name = "json"
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        """Encode an object into compact utf-8 json."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        """Decode json into an object."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec using orjson."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        """Encode an object into compact utf-8 json."""
+        return self._orjson.dumps(obj, default=_default, option=self._option)
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        """Decode json into an object."""
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec using msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        """Encode an object into compact utf-8 json."""
+        return self._encoder.encode(obj)
+
+    def loads(self, data: typing.Union[str, bytes]) -> typing.Any:
+        """Decode json into an object."""
+        return self._decoder.decode(data)
+
+
+CODECS: typing.Mapping[str, type[JSONCodec]] = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+_default_codec: JSONCodec = StdlibCodec()
+
+
+def get_json_codec(name: str = "auto") -> JSONCodec:
+    """Create a json codec by its name.
+
+    "auto" picks the fastest installed library and falls back to the standard library.
+    """
+    if name != "auto":
+        if name not in CODECS:
+            raise ValueError(f"Unknown json codec: {name!r}, must be one of {list(CODECS)}")
+
+        return CODECS[name]()
+
+    for cls in (OrjsonCodec, MsgspecCodec):
+        try:
+            return cls()
+        except ImportError:
+            pass
+
+    return StdlibCodec()
+
+
+def get_default_json_codec() -> JSONCodec:
+    """Get the json codec used when none is configured."""
+    return _default_codec
+
+
+def set_default_json_codec(codec: typing.Union[JSONCodec, str]) -> None:
+    """Set the json codec used when none is configured."""
+    global _default_codec
+    _default_codec = get_json_codec(codec) if isinstance(codec, str) else codec
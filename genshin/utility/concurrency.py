@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import abc
 import asyncio
+import bisect
+import collections
 import functools
+import time
 import typing
 
-__all__ = ["prevent_concurrency"]
+__all__ = ["Hedging", "SingleFlight", "SlotPool", "prevent_concurrency"]
 
 T = typing.TypeVar("T")
 AnyCallable = typing.Callable[..., typing.Any]
@@ -36,6 +40,199 @@ def prevent_concurrency(func: CallableT) -> CallableT:
     return typing.cast("CallableT", MethodDecorator(func, wrapper))
 
 
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into a single call.
+
+    Callers which arrive while a call is in flight await its result instead of starting a new one.
+    """
+
+    _calls: dict[typing.Hashable, asyncio.Future[typing.Any]]
+
+    def __init__(self) -> None:
+        self._calls = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._calls
+
+    def start(self, key: typing.Hashable, func: typing.Callable[[], typing.Awaitable[T]]) -> asyncio.Future[T]:
+        """Start a function in the background unless a call with the same key is already in flight."""
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(functools.partial(self._finish, key))
+
+        return future
+
+    async def run(self, key: typing.Hashable, func: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        """Run a function unless a call with the same key is already in flight."""
+        # a cancelled caller must not cancel the call for everyone else
+        return await asyncio.shield(self.start(key, func))
+
+    def _finish(self, key: typing.Hashable, future: asyncio.Future[typing.Any]) -> None:
+        """Forget a finished call."""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+        # mark the exception as retrieved in case every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+
+class SlotPool(abc.ABC):
+    """Slots held by tasks in flight, handed over to waiting tasks once they are released.
+
+    Subclasses decide when a slot is free and which waiting task gets it next.
+    """
+
+    inflight: int
+    """Number of slots held."""
+
+    def __init__(self) -> None:
+        self.inflight = 0
+
+    @abc.abstractmethod
+    def _available(self, ticket: typing.Any) -> bool:
+        """Whether a task may take a slot right away."""
+
+    @abc.abstractmethod
+    def _enqueue(self, ticket: typing.Any, future: asyncio.Future[None]) -> None:
+        """Queue a waiting task."""
+
+    @abc.abstractmethod
+    def _next_waiter(self) -> typing.Optional[asyncio.Future[None]]:
+        """Dequeue the next waiting task if there is a free slot for it."""
+
+    async def _take(self, ticket: typing.Any = None) -> None:
+        """Wait for a slot."""
+        if self._available(ticket):
+            self.inflight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(ticket, future)
+        # cancelled waiters may have left free slots behind
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was already handed over
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot."""
+        self.inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand over free slots to waiting tasks."""
+        while (future := self._next_waiter()) is not None:
+            if not future.done():
+                self.inflight += 1
+                future.set_result(None)
+
+
+class Hedging:
+    """Policy of hedged calls, cutting tail latency of idempotent calls.
+
+    A second identical call is started when the first one takes longer than `percentile` of recent calls.
+    The first successful result is used and the other call is cancelled.
+    """
+
+    percentile: float
+    minimum_delay: float
+    minimum_samples: int
+    proxy: typing.Optional[str]
+    """Proxy used by hedged requests."""
+    cookies: typing.Optional[typing.Mapping[str, str]]
+    """Cookies used by hedged requests, they should belong to the same account unless the data is public."""
+    hedged: int
+    """Number of hedged calls started."""
+    wins: int
+    """Number of hedged calls which finished first."""
+
+    _latencies: collections.deque[float]
+    _sorted: list[float]
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        *,
+        minimum_delay: float = 0.05,
+        minimum_samples: int = 20,
+        samples: int = 200,
+        proxy: typing.Optional[str] = None,
+        cookies: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> None:
+        self.percentile = percentile
+        self.minimum_delay = minimum_delay
+        self.minimum_samples = minimum_samples
+        self.proxy = proxy
+        self.cookies = cookies
+        self.hedged = 0
+        self.wins = 0
+        self._latencies = collections.deque(maxlen=samples)
+        self._sorted = []
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} delay={self.get_delay()} hedged={self.hedged} wins={self.wins}>"
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a call."""
+        if len(self._latencies) == self._latencies.maxlen:
+            del self._sorted[bisect.bisect_left(self._sorted, self._latencies[0])]
+
+        self._latencies.append(latency)
+        bisect.insort(self._sorted, latency)
+
+    def get_delay(self) -> typing.Optional[float]:
+        """Get the delay after which a call is hedged, None until enough calls were recorded."""
+        if len(self._sorted) < self.minimum_samples:
+            return None
+        if not self._sorted:
+            return self.minimum_delay
+
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * self.percentile))
+        return max(self.minimum_delay, self._sorted[index])
+
+    async def run(self, func: typing.Callable[[bool], typing.Awaitable[T]]) -> T:
+        """Run a function and run it again if it is slow.
+
+        The function is given whether it is called as the hedge.
+        """
+        start = time.monotonic()
+        primary = asyncio.ensure_future(func(False))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.get_delay())
+            if not done:
+                self.hedged += 1
+                tasks.add(asyncio.ensure_future(func(True)))
+
+            error: typing.Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                errors = [task.exception() for task in done]
+                for task, exception in zip(done, errors):
+                    if exception is None:
+                        self.record(time.monotonic() - start)
+                        self.wins += task is not primary
+                        return task.result()
+
+                error = error or errors[0]
+
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
 class MethodDecorator:
     """Descriptor which applies decorators per-instance."""
 
@@ -0,0 +1,20 @@
+"""Conditional requests utilities."""
+
+import typing
+
+__all__ = ["get_conditional_headers", "get_validators"]
+
+VALIDATORS: typing.Final[typing.Mapping[str, str]] = {
+    "ETag": "If-None-Match",
+    "Last-Modified": "If-Modified-Since",
+}
+
+
+def get_validators(headers: typing.Mapping[str, str]) -> dict[str, str]:
+    """Get the validators of a response from its headers."""
+    return {name: headers[name] for name in VALIDATORS if name in headers}
+
+
+def get_conditional_headers(validators: typing.Mapping[str, str]) -> dict[str, str]:
+    """Get the headers of a request only returning a body if it changed since the validators were received."""
+    return {VALIDATORS[name]: value for name, value in validators.items() if name in VALIDATORS}
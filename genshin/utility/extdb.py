@@ -1,8 +1,9 @@
 """External databases for Genshin Impact data."""
 
 import asyncio
-import json
+import hashlib
 import logging
+import pathlib
 import time
 import typing
 import warnings
@@ -12,7 +13,7 @@ import aiohttp
 
 from genshin.constants import LANGS
 from genshin.models.genshin import constants as model_constants
-from genshin.utility import fs
+from genshin.utility import codec, conditional, fs
 
 __all__ = (
     "update_characters_ambr",
@@ -24,9 +25,10 @@ __all__ = (
 LOGGER_ = logging.getLogger(__name__)
 
 CACHE_FILE = fs.get_tempdir() / "characters.json"
+DOWNLOADS_DIR = fs.get_tempdir() / "extdb"
 
 if CACHE_FILE.exists() and time.time() - CACHE_FILE.stat().st_mtime < 7 * 24 * 60 * 60:
-    names: typing.Mapping[str, typing.Any] = json.loads(CACHE_FILE.read_text())
+    names: typing.Mapping[str, typing.Any] = codec.get_default_json_codec().loads(CACHE_FILE.read_bytes())
     try:
         model_constants.CHARACTER_NAMES = {
             lang: {int(char_id): model_constants.DBChar(*char) for char_id, char in chars.items()}
@@ -99,17 +101,56 @@ ENKA_LANG_MAP = {
 }
 
 
+def _get_download_paths(url: str) -> tuple[pathlib.Path, pathlib.Path]:
+    """Get the paths of a downloaded file and of its validators."""
+    name = hashlib.sha1(url.encode()).hexdigest()
+    return DOWNLOADS_DIR / f"{name}.json", DOWNLOADS_DIR / f"{name}.validators.json"
+
+
+def _save_download(path: pathlib.Path, body: bytes, validators_path: pathlib.Path, validators: bytes) -> None:
+    """Save a downloaded file and its validators."""
+    DOWNLOADS_DIR.mkdir(exist_ok=True)
+    path.write_bytes(body)
+    validators_path.write_bytes(validators)
+
+
 async def _fetch_jsons(*urls: str) -> typing.Sequence[typing.Any]:
-    """Fetch multiple JSON endpoints."""
+    """Fetch multiple JSON endpoints.
+
+    Downloads are kept on disk with their validators so unchanged files are not downloaded again.
+    The files are large so they are read and written in a thread.
+    """
+    json_codec = codec.get_default_json_codec()
     async with aiohttp.ClientSession() as session:
 
         async def _fetch_and_parse(url: str) -> typing.Any:
-            r = await session.get(url)
-            return await r.json(content_type=None)
+            path, validators_path = _get_download_paths(url)
+            headers: dict[str, str] = {}
+            if path.exists() and validators_path.exists():
+                validators_body = await asyncio.to_thread(validators_path.read_bytes)
+                headers = conditional.get_conditional_headers(json_codec.loads(validators_body))
+
+            async with session.get(url, headers=headers) as r:
+                if r.status == 304:
+                    return json_codec.loads(await asyncio.to_thread(path.read_bytes))
+
+                body = await r.read()
+                validators = conditional.get_validators(r.headers)
+
+            data = json_codec.loads(body)
+            if r.ok and validators:
+                await asyncio.to_thread(_save_download, path, body, validators_path, json_codec.dumps(validators))
+
+            return data
 
         return await asyncio.gather(*(_fetch_and_parse(url) for url in urls))
 
 
+def _save_cache_file() -> None:
+    """Save the character names into the cache file."""
+    CACHE_FILE.write_bytes(codec.get_default_json_codec().dumps(model_constants.CHARACTER_NAMES))
+
+
 def update_character_name(
     lang: str,
     id: int,
@@ -162,7 +203,7 @@ async def update_characters_genshindata(langs: typing.Sequence[str] = ()) -> Non
                 rarity=RARITY_MAP[char["qualityType"]],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    _save_cache_file()
 
 
 async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
@@ -185,7 +226,7 @@ async def update_characters_enka(langs: typing.Sequence[str] = ()) -> None:
                 rarity=RARITY_MAP[char["QualityType"]],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    _save_cache_file()
 
 
 async def update_characters_ambr(langs: typing.Sequence[str] = ()) -> None:
@@ -210,7 +251,7 @@ async def update_characters_ambr(langs: typing.Sequence[str] = ()) -> None:
                 rarity=char["rank"],
             )
 
-    CACHE_FILE.write_text(json.dumps(model_constants.CHARACTER_NAMES))
+    _save_cache_file()
 
 
 async def update_characters_any(
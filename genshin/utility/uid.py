@@ -3,7 +3,7 @@
 import typing
 import warnings
 
-from genshin import types
+from genshin import constants, types
 
 __all__ = [
     "create_short_lang_code",
@@ -13,6 +13,7 @@ __all__ = [
     "recognize_honkai_server",
     "recognize_region",
     "recognize_server",
+    "recognize_server_timezone",
     "recognize_starrail_server",
     "recognize_zzz_server",
 ]
@@ -150,6 +151,20 @@ def recognize_server(uid: int, game: types.Game) -> str:
     raise ValueError(f"recognize_server is not implemented for game {game}")
 
 
+def recognize_server_timezone(uid: int, game: types.Game) -> typing.Optional[int]:
+    """Recognize the timezone offset of the server of a UID in hours."""
+    try:
+        server = recognize_server(uid, game)
+    except ValueError:
+        return None
+
+    for offset, servers in constants.SERVER_TIMEZONE_OFFSETS.items():
+        if server in servers:
+            return offset
+
+    return None
+
+
 def recognize_game(uid: int, region: types.Region) -> typing.Optional[types.Game]:
     """Recognize the game of a uid."""
     if len(str(uid)) == 8:
@@ -0,0 +1,44 @@
+"""Micro-benchmark of cache key creation and dict probes.
+
+Run with `python -m tests.benchmarks.bench_cache_key`.
+"""
+
+import dataclasses
+import timeit
+import typing
+
+from genshin.client import cache
+
+
+@dataclasses.dataclass(eq=False)
+class UncachedCacheKey:
+    """Cache key as it was before key classes were interned."""
+
+    def __str__(self) -> str:
+        values = [getattr(self, field.name) for field in dataclasses.fields(self)]
+        return cache._separate(values)  # pyright: ignore[reportPrivateUsage]
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, UncachedCacheKey) and str(self) == str(o)
+
+
+def uncached_cache_key(key: str, **kwargs: typing.Any) -> UncachedCacheKey:
+    fields = ["key", *kwargs.keys()]
+    cls = dataclasses.make_dataclass(key.capitalize() + "CacheKey", fields, bases=(UncachedCacheKey,), eq=False)
+    return cls(key, **kwargs)
+
+
+def bench(name: str, factory: typing.Callable[..., typing.Any], number: int = 10_000) -> None:
+    create = timeit.timeit(lambda: factory("user", hoyolab_id=8366222, lang="en-us"), number=number // 10)
+    key = factory("user", hoyolab_id=8366222, lang="en-us")
+    mapping = {key: None}
+    probe = timeit.timeit(lambda: key in mapping, number=number)
+    print(f"{name}: create {create / (number // 10) * 1e6:8.2f}us  probe {probe / number * 1e6:7.3f}us")  # noqa: T201
+
+
+if __name__ == "__main__":
+    bench("old", uncached_cache_key)
+    bench("new", cache.cache_key)
@@ -0,0 +1,384 @@
+import asyncio
+import contextlib
+import json
+import time
+import typing
+
+import aiohttp
+import pydantic
+import pytest
+
+import genshin
+
+
+@pytest.fixture(name="counting_client")
+def counting_client_fixture(monkeypatch: pytest.MonkeyPatch) -> genshin.Client:
+    client = genshin.Client(cache=genshin.Cache(static_ttl=10, stale_ttl=100))
+    client.calls = 0  # type: ignore
+
+    async def send_request(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        client.calls += 1  # type: ignore
+        await asyncio.sleep(0.01)
+        if client.fail:  # type: ignore
+            raise client.error  # type: ignore
+
+        response = {"calls": client.calls}  # type: ignore
+        return (response, None) if kwargs.get("return_body") else response
+
+    client.fail = False  # type: ignore
+    client.error = genshin.GenshinException(msg="Failed")  # type: ignore
+    monkeypatch.setattr(client, "_send_request", send_request)
+    return client
+
+
+async def test_request_coalescing(counting_client: genshin.Client):
+    key = genshin.client.cache.cache_key("test")
+    results = await asyncio.gather(*(counting_client.request("", cache=key) for _ in range(5)))
+
+    assert results == [{"calls": 1}] * 5
+
+
+async def test_stale_while_revalidate(counting_client: genshin.Client, monkeypatch: pytest.MonkeyPatch):
+    key = genshin.client.cache.cache_key("test")
+    now = time.time()
+
+    assert await counting_client.request("", static_cache=key) == {"calls": 1}
+
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert await counting_client.request("", static_cache=key) == {"calls": 1}
+    await asyncio.sleep(0.02)
+    assert await counting_client.request("", static_cache=key) == {"calls": 2}
+
+
+async def test_stale_if_error(counting_client: genshin.Client, monkeypatch: pytest.MonkeyPatch):
+    counting_client.stale_while_revalidate = False
+    key = genshin.client.cache.cache_key("test")
+    now = time.time()
+
+    assert await counting_client.request("", static_cache=key) == {"calls": 1}
+
+    counting_client.fail = True  # type: ignore
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert await counting_client.request("", static_cache=key) == {"calls": 1}
+    assert counting_client.calls == 2  # type: ignore
+
+    monkeypatch.setattr(time, "time", lambda: now + 500)
+    with pytest.raises(genshin.GenshinException):
+        await counting_client.request("", static_cache=key)
+
+
+async def test_negative_caching(counting_client: genshin.Client, monkeypatch: pytest.MonkeyPatch):
+    key = genshin.client.cache.cache_key("test")
+    now = time.time()
+
+    counting_client.fail = True  # type: ignore
+    counting_client.error = genshin.DataNotPublic({"retcode": 10102})  # type: ignore
+    for _ in range(3):
+        with pytest.raises(genshin.DataNotPublic):
+            await counting_client.request("", cache=key)
+
+    assert counting_client.calls == 1  # type: ignore
+
+    counting_client.fail = False  # type: ignore
+    monkeypatch.setattr(time, "time", lambda: now + counting_client.cache.error_ttl + 1)
+    assert await counting_client.request("", cache=key) == {"calls": 2}
+
+    counting_client.fail = True  # type: ignore
+    counting_client.error = genshin.GenshinException(msg="Failed")  # type: ignore
+    with pytest.raises(genshin.GenshinException):
+        await counting_client.request("", cache=genshin.client.cache.cache_key("other"))
+    assert await counting_client.cache.get(genshin.client.cache.cache_key("other")) is None
+
+
+async def test_negative_caching_uncached_responses(monkeypatch: pytest.MonkeyPatch):
+    client = genshin.Client()
+    client.set_cache()
+    calls = 0
+
+    async def send_request(*args: typing.Any, **kwargs: typing.Any) -> typing.Mapping[str, typing.Any]:
+        nonlocal calls
+        calls += 1
+        raise genshin.DataNotPublic({"retcode": 10102})
+
+    monkeypatch.setattr(client, "_send_request", send_request)
+    key = genshin.client.components.chronicle.base.ChronicleCacheKey(genshin.Game.GENSHIN, "index", 1, "en-us")
+
+    # chronicle responses aren't cached without a ttl policy but private profiles are remembered
+    for _ in range(3):
+        with pytest.raises(genshin.DataNotPublic):
+            await client.request("", error_cache=key)
+
+    assert calls == 1
+
+
+async def test_cached_model():
+    class ModelClient(genshin.Client):
+        calls = 0
+
+        @genshin.client.components.base.cached_model(genshin.Game.GENSHIN)
+        async def get_model(self, value: str, *, raw: bool = False) -> typing.List[typing.List[str]]:
+            self.calls += 1
+            return [[value]]
+
+    client = ModelClient(model_cache=genshin.Cache())
+
+    model = await client.get_model("a")
+    assert model == (["a"],)
+    assert await client.get_model(value="a") is model
+    assert await client.get_model("b") == [["b"]]
+    assert client.calls == 2
+
+    await client.get_model("a", raw=True)
+    assert client.calls == 3
+
+    client.uids = {genshin.Game.GENSHIN: 710785423}
+    await client.get_model("c")
+    await client.invalidate_cache(uid=710785423, game=genshin.Game.GENSHIN)
+    await client.get_model("c")
+    assert client.calls == 5
+
+
+async def test_cached_model_frozen():
+    class Child(genshin.models.APIModel):
+        id: int
+
+    class Model(genshin.models.APIModel):
+        id: int
+        children: typing.List[Child]
+
+    class ModelClient(genshin.Client):
+        calls = 0
+
+        @genshin.client.components.base.cached_model(genshin.Game.GENSHIN)
+        async def get_model(self, uid: typing.Optional[int] = None) -> Model:
+            self.calls += 1
+            return Model(id=1, children=[Child(id=2)])
+
+    client = ModelClient(model_cache=genshin.Cache())
+    client.uids = {genshin.Game.GENSHIN: 710785423}
+
+    model = await client.get_model()
+    assert await client.get_model(710785423) is model
+    assert client.calls == 1
+
+    with pytest.raises(pydantic.ValidationError):
+        model.id = 3
+    with pytest.raises(pydantic.ValidationError):
+        model.children[0].id = 3
+
+    assert isinstance(model, Model)
+    assert type(model).__name__ == "Model"
+    assert model.model_dump() == {"id": 1, "children": [{"id": 2}]}
+
+
+async def test_invalidate_cache(counting_client: genshin.Client):
+    key = genshin.client.cache.cache_key("diary", uid=710785423, game=genshin.Game.GENSHIN)
+    other_key = genshin.client.cache.cache_key("diary", uid=901211014, game=genshin.Game.GENSHIN)
+
+    assert await counting_client.request("", cache=key) == {"calls": 1}
+    assert await counting_client.request("", cache=other_key) == {"calls": 2}
+
+    await counting_client.invalidate_cache(uid=710785423, family="diary")
+    assert await counting_client.request("", cache=key) == {"calls": 3}
+    assert await counting_client.request("", cache=other_key) == {"calls": 2}
+
+
+async def test_invalidate_account_cache(counting_client: genshin.Client, monkeypatch: pytest.MonkeyPatch):
+    key = genshin.client.cache.cache_key("diary", uid=710785423, game=genshin.Game.GENSHIN)
+    uid: typing.Optional[int] = None
+
+    async def get_uid(game: genshin.Game) -> int:
+        if uid is None:
+            raise genshin.errors.AccountNotFound
+        return uid
+
+    monkeypatch.setattr(counting_client, "_get_uid", get_uid)
+    assert await counting_client.request("", cache=key) == {"calls": 1}
+
+    # an unknown account must not invalidate every account's objects
+    await counting_client._invalidate_account_cache(genshin.Game.GENSHIN, family="diary")
+    assert await counting_client.request("", cache=key) == {"calls": 1}
+
+    uid = 710785423
+    await counting_client._invalidate_account_cache(genshin.Game.GENSHIN, family="diary")
+    assert await counting_client.request("", cache=key) == {"calls": 2}
+
+
+async def test_cache_policy(counting_client: genshin.Client, monkeypatch: pytest.MonkeyPatch):
+    key = genshin.client.cache.cache_key("test")
+    now = time.time()
+
+    with pytest.raises(genshin.CacheMiss):
+        await counting_client.request("", cache=key, cache_policy=genshin.CachePolicy.CACHE_ONLY)
+    assert counting_client.calls == 0  # type: ignore
+
+    assert await counting_client.request("", cache=key) == {"calls": 1}
+    assert await counting_client.request("", cache=key, cache_policy=genshin.CachePolicy.NETWORK_ONLY) == {"calls": 2}
+    with genshin.use_cache_policy("network-only"):
+        assert await counting_client.request("", cache=key) == {"calls": 3}
+    assert await counting_client.request("", cache=key) == {"calls": 3}
+
+    counting_client.fail = True  # type: ignore
+    monkeypatch.setattr(time, "time", lambda: now + counting_client.cache.ttl + 10)
+    with pytest.raises(genshin.GenshinException):
+        await counting_client.request("", cache=key)
+
+    counting_client.cache_policy = genshin.CachePolicy.STALE_IF_ERROR
+    assert await counting_client.request("", cache=key) == {"calls": 3}
+    assert await counting_client.request("", cache=key, cache_policy=genshin.CachePolicy.CACHE_ONLY) == {"calls": 3}
+
+
+async def test_webstatic_conditional_request(monkeypatch: pytest.MonkeyPatch):
+    client = genshin.Client(cache=genshin.Cache(static_ttl=10, stale_ttl=100))
+    client.stale_while_revalidate = False
+    requests: typing.List[typing.Mapping[str, str]] = []
+
+    class Response:
+        status = 200
+        headers = {"ETag": '"v1"'}
+
+        def raise_for_status(self) -> None:
+            pass
+
+        async def read(self) -> bytes:
+            return b'{"value": 1}'
+
+        async def __aenter__(self) -> "Response":
+            return self
+
+        async def __aexit__(self, *args: typing.Any) -> None:
+            pass
+
+    class Session:
+        def get(self, url: typing.Any, *, headers: typing.Mapping[str, str], **kwargs: typing.Any) -> Response:
+            requests.append(headers)
+            response = Response()
+            if headers.get("If-None-Match") == '"v1"':
+                response.status = 304
+
+            return response
+
+    @contextlib.asynccontextmanager
+    async def acquire_session() -> typing.AsyncIterator[Session]:
+        yield Session()
+
+    monkeypatch.setattr(client.cookie_manager, "acquire_session", acquire_session)
+    key = genshin.client.cache.cache_key("banner", endpoint="ids")
+    now = time.time()
+
+    assert await client.request_webstatic("", cache=key) == {"value": 1}
+    assert "If-None-Match" not in requests[0]
+    # validators are saved along with the file
+    assert len(client.cache) == 1  # type: ignore
+
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert await client.request_webstatic("", cache=key) == {"value": 1}
+    assert requests[1]["If-None-Match"] == '"v1"'
+    assert await client.request_webstatic("", cache=key) == {"value": 1}
+    assert len(requests) == 2
+
+
+async def test_hedged_requests():
+    client = genshin.Client(hedging=genshin.utility.Hedging(minimum_samples=0, minimum_delay=0))
+    sent: typing.List[str] = []
+
+    async def request(url: typing.Any, *, method: str, **kwargs: typing.Any) -> typing.Mapping[str, typing.Any]:
+        sent.append(method)
+        await asyncio.sleep(0.01)
+        return {}
+
+    client.cookie_manager.request = request  # type: ignore
+    await client._send_request("", method="GET")
+    assert sent == ["GET", "GET"]
+
+    await client._send_request("", method="POST")
+    await client._send_request("", method="GET", hedge=False)
+    assert sent == ["GET", "GET", "POST", "GET"]
+
+
+async def test_hedged_request_cookies():
+    hedging = genshin.utility.Hedging(minimum_samples=0, minimum_delay=0, cookies={"ltuid_v2": "2"})
+    client = genshin.Client({"ltuid_v2": "1"}, hedging=hedging)
+    sent: typing.List[str] = []
+
+    async def request(method: str, url: typing.Any, cookies: typing.Mapping[str, str], **kwargs: typing.Any) -> str:
+        sent.append(cookies["ltuid_v2"])
+        await asyncio.sleep(0.01 if cookies["ltuid_v2"] == "1" else 0)
+        return cookies["ltuid_v2"]
+
+    client.cookie_manager._request = request  # type: ignore
+    assert await client._send_request("", method="GET") == "2"
+    assert sent == ["1", "2"]
+
+
+async def test_session_reuse(monkeypatch: pytest.MonkeyPatch):
+    client = genshin.Client()
+
+    async with client:
+        async with client.cookie_manager.acquire_session() as session:
+            pass
+        async with client.cookie_manager.acquire_session() as other:
+            assert other is session
+
+        # sessions can't switch to a socks proxy, requests still using the old one aren't interrupted
+        monkeypatch.setattr(client.cookie_manager, "create_session", aiohttp.ClientSession)
+        async with client.cookie_manager.acquire_session() as inflight:
+            monkeypatch.setattr(client.cookie_manager, "_socks_proxy", "socks5://localhost:1080")
+            async with client.cookie_manager.acquire_session() as other:
+                assert other is not session
+            assert not session.closed
+        assert inflight is session
+        assert session.closed
+
+    assert other.closed
+    assert not client.cookie_manager.keep_alive
+
+    async with client.cookie_manager.acquire_session() as session:
+        pass
+    assert session.closed
+
+
+async def test_replace_cookie_manager():
+    limiter = genshin.RateLimiter()
+    client = genshin.Client(keep_alive=True, rate_limiter=limiter)
+
+    old = client.cookie_manager
+    async with old.acquire_session() as session:
+        pass
+
+    client.cookie_manager = genshin.InternationalCookieManager({})
+    assert isinstance(client.cookie_manager, genshin.InternationalCookieManager)
+    assert client.cookie_manager.keep_alive
+    assert client.cookie_manager.rate_limiter is limiter
+
+    # the session now only belongs to the new manager
+    await old.close()
+    assert not session.closed
+    async with client.cookie_manager.acquire_session() as other:
+        assert other is session
+
+    await client.close()
+    assert session.closed
+
+
+async def test_request_body_serializer():
+    client = genshin.Client(json_codec=genshin.utility.get_json_codec("json"))
+
+    # the cn dynamic secret is signed with json.dumps of the body
+    async with client.cookie_manager.create_session() as session:
+        assert session.json_serialize is json.dumps
+
+
+async def test_connection_config():
+    config = genshin.ConnectionConfig(limit=10, limit_per_host=5, keepalive_timeout=15)
+    client = genshin.Client(connection_config=config)
+
+    async with client.cookie_manager.create_session() as session:
+        connector = session.connector
+        assert isinstance(connector, aiohttp.TCPConnector)
+        assert connector.limit == 10
+        assert connector.limit_per_host == 5
+
+    async with client.cookie_manager.create_session(genshin.ConnectionConfig(limit=0)) as session:
+        assert session.connector is not None
+        assert session.connector.limit == 0
@@ -0,0 +1,326 @@
+import asyncio
+import copy
+import dataclasses
+import datetime
+import pathlib
+import time
+import typing
+
+import pytest
+
+import genshin
+
+
+async def test_cache_lru():
+    cache = genshin.Cache(maxsize=2)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1
+
+    await cache.set("c", 3)
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+    assert len(cache) == 2
+
+
+async def test_cache_expiration(monkeypatch: pytest.MonkeyPatch):
+    cache = genshin.Cache(ttl=10, static_ttl=100)
+    now = time.time()
+
+    await cache.set("a", 1)
+    await cache.set_static("b", 2)
+
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert await cache.get("a") is None
+    assert await cache.get_static("b") == 2
+    assert len(cache) == 1
+
+    monkeypatch.setattr(time, "time", lambda: now + 150)
+    assert len(cache) == 0
+
+
+async def test_cache_overwrite_expiration(monkeypatch: pytest.MonkeyPatch):
+    cache = genshin.Cache(ttl=10)
+    now = time.time()
+
+    monkeypatch.setattr(time, "time", lambda: now)
+    await cache.set("a", 1)
+    monkeypatch.setattr(time, "time", lambda: now + 5)
+    await cache.set("a", 2)
+
+    monkeypatch.setattr(time, "time", lambda: now + 12)
+    assert len(cache) == 1
+    assert await cache.get("a") == 2
+
+
+def test_cache_key():
+    key = genshin.client.cache.cache_key("calculator", slug="characters", lang="en-us")
+    other = genshin.client.cache.cache_key("calculator", slug="characters", lang="en-us")
+
+    assert type(key) is type(other)
+    assert str(key) == "calculator:characters:en-us"
+    assert key == other
+    assert hash(key) == hash(other)
+    assert key != genshin.client.cache.cache_key("calculator", slug="weapons", lang="en-us")
+
+    chronicle_key = genshin.client.components.chronicle.base.ChronicleCacheKey(
+        genshin.Game.GENSHIN, "index", 710785423, "en-us"
+    )
+    assert str(chronicle_key) == "chronicle:genshin:index:710785423:en-us"
+    assert copy.deepcopy(chronicle_key) == chronicle_key
+    assert not hasattr(key, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        key.lang = "ja-jp"  # type: ignore
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+async def test_sqlite_cache(tmp_path: pathlib.Path, persistent: bool):
+    pytest.importorskip("aiosqlite")
+
+    cache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"), persistent=persistent)
+    await cache.initialize()
+
+    await cache.set("a", {"value": 1})
+    await cache.set_many({"b": [2], "c": "3"}, static=True)
+
+    assert await cache.get("a") == {"value": 1}
+    assert await cache.get_many(["a", "b", "d", "c"]) == [{"value": 1}, [2], None, "3"]
+    assert (cache._clear_task is not None) == persistent
+
+    await cache.close()
+    assert cache._clear_task is None
+
+
+async def test_sqlite_cache_background_clear(tmp_path: pathlib.Path):
+    pytest.importorskip("aiosqlite")
+
+    cache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"), persistent=True, clear_interval=0.01)
+    await cache.initialize()
+    await cache.set("a", 1)
+
+    assert cache.conn is not None
+    await cache.conn.execute("UPDATE cache SET expiration = 0")
+    await cache.conn.commit()
+
+    # nothing is saved anymore, the expired item is still cleared
+    await asyncio.sleep(0.1)
+    assert cache.expirations == 1
+
+    await cache.close()
+
+
+@pytest.mark.parametrize("compression_level", [None, 6])
+def test_redis_cache_serialization(compression_level: typing.Optional[int]):
+    cache = genshin.RedisCache(None, compression_level=compression_level, compression_threshold=16)  # type: ignore
+    value = {"list": [{"name": "Kamisato Ayaka", "level": 90}] * 10}
+
+    serialized = cache.serialize_value(value)
+    assert serialized.startswith(cache.COMPRESSED_PREFIX) == (compression_level is not None)
+    assert cache.deserialize_value(serialized) == value
+    assert cache.deserialize_value(cache.serialize_value(1)) == 1
+
+
+async def test_tiered_cache():
+    l2 = genshin.Cache()
+    cache = genshin.TieredCache(l2, maxsize=1)
+
+    await cache.set("a", 1)
+    assert await l2.get("a") == 1
+    assert await cache.get("a") == 1
+
+    await l2.set("b", 2)
+    assert await cache.get("b") == 2
+    assert await cache.l1.get("b") == 2
+    assert await cache.get("c") is None
+
+    assert (cache.l1_hits, cache.l1_misses, cache.l2_hits, cache.l2_misses) == (1, 2, 1, 1)
+
+    cache.error_ttl = 5
+    assert l2.error_ttl == 5
+
+
+async def test_redis_error_ttl(monkeypatch: pytest.MonkeyPatch):
+    cache = genshin.RedisCache(None, stale_ttl=300)  # type: ignore
+    cache.error_ttl = 60
+    saved: typing.List[typing.Any] = []
+
+    async def _set(items: typing.Iterable[typing.Any]) -> None:
+        saved.extend(items)
+
+    monkeypatch.setattr(cache, "_set", _set)
+    await cache.set_error("key", {"retcode": -1})
+
+    # the error is only stale for the last stale_ttl seconds like any other item
+    assert saved[0][2] == 360
+
+
+async def test_cache_stats():
+    cache = genshin.SizedCache(maxsize=1)
+    accounts_key = genshin.client.cache.cache_key("accounts", hoyolab_id=1)
+    chronicle_key = genshin.client.components.chronicle.base.ChronicleCacheKey(
+        genshin.Game.GENSHIN, "index", 710785423, "en-us"
+    )
+
+    await cache.set(accounts_key, {"list": []})
+    assert await cache.get(accounts_key) == {"list": []}
+    await cache.set(chronicle_key, {})
+    assert await cache.get(accounts_key) is None
+
+    accounts = cache.stats.families["accounts"]
+    assert (accounts.hits, accounts.misses, accounts.sets, accounts.evictions) == (1, 1, 1, 1)
+    assert accounts.bytes == 0
+    assert accounts.bytes_written > 0
+    assert cache.stats.total.bytes == cache.stats.families["chronicle:index"].bytes > 0
+    assert cache.stats.families["chronicle:index"].sets == 1
+    assert cache.stats.total.sets == 2
+
+
+async def test_cache_stats_raw_body():
+    cache = genshin.Cache()
+    key = genshin.client.cache.cache_key("accounts", hoyolab_id=1)
+
+    await cache.set(key, {"list": []})
+    assert cache.stats.total.bytes == 0
+
+    await cache.set_response(key, {"list": []}, b'{"data":{"list":[]}}')
+    assert cache.stats.total.bytes == cache.stats.total.bytes_written == 20
+
+
+async def test_sized_cache():
+    cache = genshin.SizedCache(maxbytes=10_000, eviction_window=2)
+
+    await cache.set("small", "a")
+    await cache.set("large", "a" * 6000)
+    assert cache.size > 6000
+
+    await cache.set("new", "b" * 5000)
+    assert await cache.get("small") == "a"
+    assert await cache.get("large") is None
+    assert await cache.get("new") is not None
+    assert cache.size <= 10_000
+
+    await cache.set("small", "b")
+    assert len(cache) == 2
+
+    await cache.set("small", "c" * 20_000)
+    assert await cache.get("small") is None
+    assert await cache.get("new") is not None
+    assert len(cache) == 1
+
+
+async def test_raw_response_body(tmp_path: pathlib.Path):
+    pytest.importorskip("aiosqlite")
+
+    body = b'{"retcode":0,"message":"OK","data":{"list":[1,2,3]}}'
+    response = {"list": [1, 2, 3]}
+
+    redis_cache = genshin.RedisCache(None)  # type: ignore
+    serialized = redis_cache.serialize_value(response, body)
+    assert serialized == redis_cache.RAW_PREFIX + body
+    assert redis_cache.deserialize_value(serialized) == {"list": [1, 2, 3]}
+    # redis clients with decode_responses=True return strings
+    assert redis_cache.deserialize_value(serialized.decode()) == {"list": [1, 2, 3]}  # type: ignore
+
+    sqlite_cache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"))
+    await sqlite_cache.initialize()
+    await sqlite_cache.set_response("key", response, body)
+    assert await sqlite_cache.get("key") == {"list": [1, 2, 3]}
+
+
+async def test_ttl_policy(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    ttl_policy = genshin.TTLPolicy({"chronicle": 600, "chronicle:dailyNote": 60}, diary=300)
+    note_key = genshin.client.components.chronicle.base.ChronicleCacheKey(
+        genshin.Game.GENSHIN, "dailyNote", 710785423, "en-us"
+    )
+    abyss_key = genshin.client.components.chronicle.base.ChronicleCacheKey(
+        genshin.Game.GENSHIN, "spiralAbyss", 710785423, "en-us"
+    )
+
+    assert ttl_policy.get_ttl(note_key, 3600) == 60
+    assert ttl_policy.get_ttl(abyss_key, 3600) == 600
+    assert ttl_policy.get_ttl(genshin.client.cache.cache_key("diary", uid=1), 3600) == 300
+    assert ttl_policy.get_ttl("banner", 3600) == 3600
+    assert ttl_policy.capped(120).get_ttl(abyss_key, 3600) == 120
+
+    cache = genshin.Cache(ttl=3600, ttl_policy=ttl_policy)
+    await cache.set(note_key, 1)
+    await cache.set(abyss_key, 2)
+    await cache.set("banner", 3)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert await cache.get(note_key) is None
+    assert await cache.get(abyss_key) == 2
+    assert await cache.get("banner") == 3
+    monkeypatch.undo()
+
+    pytest.importorskip("aiosqlite")
+
+    sqlite_cache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"), ttl_policy=ttl_policy)
+    await sqlite_cache.initialize()
+    await sqlite_cache.set_many({note_key: 1, "banner": 3})
+
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert await sqlite_cache.get_many([note_key, "banner"]) == [None, 3]
+
+
+def test_game_reset():
+    now = datetime.datetime(2024, 12, 31, 3, tzinfo=datetime.timezone(datetime.timedelta(hours=8)))
+
+    assert genshin.GameReset().next_reset(8, now) == now.replace(hour=4)
+    assert genshin.GameReset().next_reset(1, now) == datetime.datetime(
+        2024, 12, 31, 4, tzinfo=datetime.timezone(datetime.timedelta(hours=1))
+    )
+    assert genshin.GameReset("weekly").next_reset(8, now) == now.replace(year=2025, month=1, day=6, hour=4)
+    assert genshin.GameReset("monthly", day=16).next_reset(8, now) == now.replace(year=2025, month=1, day=16, hour=4)
+    with pytest.raises(ValueError, match="between 1 and 28"):
+        genshin.GameReset("monthly", day=31)
+
+    key = genshin.client.components.chronicle.base.ChronicleCacheKey(
+        genshin.Game.GENSHIN, "spiralAbyss", 710785423, "en-us"
+    )
+    assert 0 < genshin.GameReset().get_ttl(key) <= genshin.client.cache.DAY
+    assert genshin.GameReset(maximum=60).get_ttl(key) <= 60
+    assert genshin.TTLPolicy(chronicle=genshin.GameReset()).capped(60).get_ttl(key, 3600) <= 60
+
+    # unknown servers fall back to the earliest reset instead of raising
+    unknown_key = genshin.client.components.chronicle.base.ChronicleCacheKey(genshin.Game.GENSHIN, "index", 1, "en-us")
+    assert 0 < genshin.GameReset().get_ttl(unknown_key) <= genshin.client.cache.DAY
+    with pytest.raises(ValueError):
+        genshin.Client(game=genshin.Game.GENSHIN, uid=1).get_account_timezone()
+
+    policy = genshin.TTLPolicy(chronicle=genshin.GameReset(maximum=0.5))
+    redis_cache = genshin.RedisCache(None, ttl_policy=policy)  # type: ignore
+    assert redis_cache._expire(key) == 1
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+async def test_invalidate(tmp_path: pathlib.Path, backend: str):
+    if backend == "sqlite":
+        pytest.importorskip("aiosqlite")
+        cache: genshin.BaseCache = genshin.SQLiteCache(db_name=str(tmp_path / "cache.db"))
+        await cache.initialize()  # type: ignore
+    else:
+        cache = genshin.Cache()
+
+    ChronicleCacheKey = genshin.client.components.chronicle.base.ChronicleCacheKey
+    notes = ChronicleCacheKey(genshin.Game.GENSHIN, "dailyNote", 710785423, "en-us")
+    index = ChronicleCacheKey(genshin.Game.GENSHIN, "index", 710785423, "en-us")
+    other = ChronicleCacheKey(genshin.Game.GENSHIN, "index", 901211014, "en-us")
+    diary = genshin.client.cache.cache_key("diary", uid=710785423, game=genshin.Game.GENSHIN, month=1, lang="en-us")
+    starrail = ChronicleCacheKey(genshin.Game.STARRAIL, "index", 710785423, "en-us")
+    keys = [notes, index, other, diary, starrail, "banner:names"]
+    await cache.set_many({key: str(key) for key in keys})
+
+    assert await cache.invalidate(uid=710785423, game=genshin.Game.GENSHIN, family="chronicle:index") == 1
+    assert await cache.get_many(keys) == [str(notes), None, str(other), str(diary), str(starrail), "banner:names"]
+
+    assert await cache.invalidate(uid=710785423, game=genshin.Game.GENSHIN) == 2
+    assert await cache.invalidate(family="chronicle") == 2
+    assert await cache.invalidate(prefix="banner:") == 1
+    assert await cache.get_many(keys) == [None] * len(keys)
+
+    with pytest.raises(TypeError):
+        await cache.invalidate()
@@ -0,0 +1,143 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+import genshin
+from genshin.client import ratelimit
+
+
+def test_endpoint_family():
+    assert ratelimit.get_endpoint_family(genshin.client.routes.RECORD_URL.get_url("os", "genshin")) == "chronicle"
+    assert ratelimit.get_endpoint_family(genshin.client.routes.GACHA_URL.get_url("os", "hkrpg")) == "gacha"
+    assert ratelimit.get_endpoint_family(genshin.client.routes.REWARD_URL.get_url("os", "genshin")) == "daily"
+    assert ratelimit.get_endpoint_family(genshin.client.routes.BBS_URL.get_url("os")) == "hoyolab"
+
+
+def test_token_bucket(monkeypatch: pytest.MonkeyPatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    bucket = genshin.TokenBucket(genshin.RateLimit(2, burst=2))
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+    assert bucket.full
+    assert bucket.reserve() == 0
+
+
+async def test_rate_limiter():
+    limiter = genshin.RateLimiter({"chronicle": genshin.RateLimit(1000, burst=1)})
+    url = genshin.client.routes.RECORD_URL.get_url("os", "genshin") / "index"
+
+    assert limiter.get_bucket(genshin.client.routes.BBS_URL.get_url("os")) is None
+    assert limiter.get_bucket(url, "1") is limiter.get_bucket(url, "1")
+    assert limiter.get_bucket(url, "1") is not limiter.get_bucket(url, "2")
+
+    await limiter.acquire(url, "3")
+    await limiter.acquire(url, "3")
+    assert limiter.waits == 1
+
+
+async def test_adaptive_concurrency_limiter():
+    limiter = genshin.AdaptiveConcurrencyLimiter(4, maximum=8)
+    url = "https://bbs-api-os.hoyolab.com/"
+    peak = 0
+
+    async def request(fail: bool = False) -> None:
+        nonlocal peak
+        async with limiter.limit(url) as limit:
+            peak = max(peak, limit.inflight)
+            await asyncio.sleep(0.01)
+            if fail:
+                raise genshin.errors.VisitsTooFrequently
+
+    await asyncio.gather(*(request() for _ in range(10)))
+    limit = limiter.get_limit(url)
+    assert 4 <= peak < 10
+    assert limit.limit > 4
+    assert limit.successes == 10
+    assert limit.inflight == 0
+
+    before = limit.limit
+    results = await asyncio.gather(*(request(fail=True) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, genshin.errors.VisitsTooFrequently) for result in results)
+    assert limit.limit == before / 2
+    assert limit.decreases == 1
+    assert limit.overloads == 3
+
+
+def test_retry_budget():
+    budget = genshin.RetryBudget(0.5, minimum=1)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    for _ in range(4):
+        budget.record_request()
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    assert budget.rejected == 2
+
+
+async def test_retry_budget_stops_retries(monkeypatch: pytest.MonkeyPatch):
+    manager = genshin.CookieManager()
+    manager.retry_budget = genshin.RetryBudget(0, minimum=0)
+    calls = 0
+
+    async def send_request(*args: object, **kwargs: object) -> None:
+        nonlocal calls
+        calls += 1
+        raise TimeoutError
+
+    monkeypatch.setattr(manager, "_send_request", send_request)
+    with pytest.raises(TimeoutError):
+        await manager.request("https://bbs-api-os.hoyolab.com/")
+
+    assert calls == 1
+
+
+def test_circuit_breaker(monkeypatch: pytest.MonkeyPatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    breaker = genshin.CircuitBreaker(0.5, minimum=4, recovery_time=10)
+    url = "https://bbs-api-os.hoyolab.com/"
+
+    def request(failed: bool) -> None:
+        with breaker.guard(url):
+            if failed:
+                raise TimeoutError
+
+    for failed in (False, True, False, True):
+        with contextlib.suppress(TimeoutError):
+            request(failed)
+
+    circuit = breaker.get_circuit("bbs-api-os.hoyolab.com")
+    assert circuit.state == "open"
+    with pytest.raises(genshin.CircuitOpen):
+        request(False)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    with pytest.raises(TimeoutError):
+        request(True)
+    assert circuit.state == "open"
+    assert circuit.trips == 2
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 22)
+    request(False)
+    assert circuit.state == "closed"
+
+
+def test_circuit_breaker_server_errors():
+    breaker = genshin.CircuitBreaker(0.5, minimum=2)
+
+    for _ in range(2):
+        with contextlib.suppress(genshin.ServerError), breaker.guard("https://bbs-api-os.hoyolab.com/"):
+            raise genshin.ServerError(msg="Recieved an error page with status 503")
+
+    assert breaker.get_circuit("bbs-api-os.hoyolab.com").state == "open"
@@ -0,0 +1,110 @@
+import asyncio
+import typing
+
+import pytest
+
+import genshin
+
+
+async def test_scheduler_priority():
+    scheduler = genshin.RequestScheduler(1, reserved=0)
+    order: typing.List[str] = []
+
+    async def request(name: str, priority: genshin.Priority, flow: str) -> None:
+        async with scheduler.slot(priority, flow):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await scheduler.acquire()
+    tasks = [
+        asyncio.create_task(request("a1", genshin.Priority.BACKGROUND, "a")),
+        asyncio.create_task(request("a2", genshin.Priority.BACKGROUND, "a")),
+        asyncio.create_task(request("a3", genshin.Priority.BACKGROUND, "a")),
+        asyncio.create_task(request("b1", genshin.Priority.BACKGROUND, "b")),
+        asyncio.create_task(request("i1", genshin.Priority.INTERACTIVE, "i")),
+    ]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["i1", "a1", "b1", "a2", "a3"]
+    assert scheduler.inflight == 0
+
+
+async def test_scheduler_reserved():
+    scheduler = genshin.RequestScheduler(2, reserved=1)
+
+    await scheduler.acquire(genshin.Priority.BACKGROUND)
+    background = asyncio.create_task(scheduler.acquire(genshin.Priority.BACKGROUND))
+    await asyncio.sleep(0)
+    assert not background.done()
+
+    await asyncio.wait_for(scheduler.acquire(genshin.Priority.INTERACTIVE), 1)
+    scheduler.release()
+    scheduler.release()
+    await asyncio.wait_for(background, 1)
+
+    with pytest.raises(ValueError, match="At least one slot"):
+        genshin.RequestScheduler(1, reserved=1)
+
+
+async def test_use_priority():
+    scheduler = genshin.RequestScheduler(1, reserved=0)
+    await scheduler.acquire()
+
+    async def request() -> None:
+        async with scheduler.slot():
+            pass
+
+    with genshin.use_priority(genshin.Priority.BACKGROUND, flow="job"):
+        task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+
+    assert scheduler.waits[genshin.Priority.BACKGROUND] == 1
+    scheduler.release()
+    await task
+    assert scheduler.inflight == 0
+
+
+async def test_slot_per_attempt(monkeypatch: pytest.MonkeyPatch):
+    manager = genshin.CookieManager()
+    scheduler = manager.scheduler = genshin.RequestScheduler(1, reserved=0)
+    inflight: typing.List[int] = []
+
+    async def send_request(*args: object, **kwargs: object) -> typing.Mapping[str, typing.Any]:
+        inflight.append(scheduler.inflight)
+        if len(inflight) == 1:
+            raise genshin.errors.VisitsTooFrequently
+        return {}
+
+    async def sleep(delay: float) -> None:
+        inflight.append(scheduler.inflight)
+
+    monkeypatch.setattr(manager, "_send_request", send_request)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    await manager.request("https://bbs-api-os.hoyolab.com/", priority=genshin.Priority.BACKGROUND)
+
+    # the slot is released while waiting to retry
+    assert inflight == [1, 0, 1]
+    assert scheduler.inflight == 0
+
+
+async def test_slot_after_ratelimit(monkeypatch: pytest.MonkeyPatch):
+    manager = genshin.CookieManager()
+    scheduler = manager.scheduler = genshin.RequestScheduler(1, reserved=0)
+    manager.rate_limiter = genshin.RateLimiter(default=genshin.RateLimit(1, burst=1))
+    inflight: typing.List[int] = []
+
+    async def send_request(*args: object, **kwargs: object) -> typing.Mapping[str, typing.Any]:
+        return {}
+
+    async def sleep(delay: float) -> None:
+        inflight.append(scheduler.inflight)
+
+    monkeypatch.setattr(manager, "_send_request", send_request)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    for _ in range(2):
+        await manager.request("https://bbs-api-os.hoyolab.com/", priority=genshin.Priority.BACKGROUND)
+
+    # throttled requests don't hold a slot
+    assert inflight == [0]
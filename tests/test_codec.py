@@ -0,0 +1,33 @@
+import pytest
+
+from genshin.models.genshin import constants
+from genshin.utility import codec
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_codec_roundtrip(name: str):
+    if name != "json":
+        pytest.importorskip(name)
+
+    json_codec = codec.get_json_codec(name)
+
+    data = {"retcode": 0, "message": "OK", "data": {"name": "Lumine", "level": 90, "list": [1.5, None, True]}}
+    encoded = json_codec.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert json_codec.loads(encoded) == data
+    assert json_codec.loads(encoded.decode()) == data
+
+    names = {"en-us": {10000002: constants.DBChar(10000002, "Ayaka", "Kamisato Ayaka", "Cryo", 5)}}
+    assert json_codec.loads(json_codec.dumps(names)) == {"en-us": {"10000002": list(names["en-us"][10000002])}}
+
+
+def test_default_codec():
+    default = codec.get_default_json_codec()
+    try:
+        codec.set_default_json_codec("json")
+        assert isinstance(codec.get_default_json_codec(), codec.StdlibCodec)
+    finally:
+        codec.set_default_json_codec(default)
+
+    with pytest.raises(ValueError, match="Unknown json codec"):
+        codec.get_json_codec("simplejson")
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from genshin.utility import concurrency
+
+
+async def test_single_flight():
+    single_flight = concurrency.SingleFlight()
+    calls = 0
+
+    async def func() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(single_flight.run("key", func) for _ in range(5)))
+    assert results == [1] * 5
+    assert len(single_flight) == 0
+
+    assert await single_flight.run("key", func) == 2
+
+
+async def test_single_flight_exception():
+    single_flight = concurrency.SingleFlight()
+
+    async def func() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("Failed")
+
+    with pytest.raises(ValueError, match="Failed"):
+        await asyncio.gather(single_flight.run("key", func), single_flight.run("key", func))
+
+    assert "key" not in single_flight
+
+
+async def test_hedging():
+    hedging = concurrency.Hedging(0.5, minimum_delay=0.01, minimum_samples=2)
+    hedged: list[bool] = []
+
+    async def func(hedge: bool) -> bool:
+        hedged.append(hedge)
+        await asyncio.sleep(0 if hedge else 0.1)
+        return hedge
+
+    assert hedging.get_delay() is None
+    assert await hedging.run(func) is False
+    assert await hedging.run(func) is False
+    assert hedged == [False, False]
+
+    hedging._latencies.clear()
+    hedging._sorted = [0.01, 0.01]
+    assert await hedging.run(func) is True
+    assert hedging.hedged == 1
+    assert hedging.wins == 1
+
+
+async def test_hedging_exception():
+    hedging = concurrency.Hedging(minimum_samples=0, minimum_delay=0)
+
+    async def func(hedge: bool) -> bool:
+        await asyncio.sleep(0.01)
+        raise ValueError(hedge)
+
+    with pytest.raises(ValueError, match="True|False"):
+        await hedging.run(func)